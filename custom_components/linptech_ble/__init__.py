@@ -7,26 +7,72 @@ https://github.com/xxddff/linptech_ble
 
 from __future__ import annotations
 
+import asyncio
+import time
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from homeassistant.components.bluetooth import BluetoothScanningMode
+from homeassistant.components.bluetooth.const import DOMAIN as BLUETOOTH_DOMAIN
 from homeassistant.components.bluetooth.passive_update_processor import (
     PassiveBluetoothProcessorCoordinator,
 )
-from homeassistant.const import CONF_ADDRESS, Platform
-
-from .const import CONF_BINDKEY, DOMAIN, LOGGER
-from .device import LinptechBluetoothDeviceData
+from homeassistant.const import (
+    CONF_ADDRESS,
+    CONF_DEVICE_ID,
+    CONF_TYPE,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    Platform,
+)
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    ATTR_MONOTONIC_TIME,
+    CONF_BINDKEY,
+    CONF_FALLBACK_BINDKEYS,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_OCCUPANCY_LOG,
+    DATA_FLEET_STORE,
+    DOMAIN,
+    EVENT_OCCUPANCY,
+    LOGGER,
+    OCCUPANCY_LOG_FLUSH_INTERVAL,
+    TRIGGER_OCCUPIED,
+    TRIGGER_VACATED,
+)
+from .data import LinptechBleData
+from .device import create_device_data
+from .longterm import async_setup_long_term_statistics
+from .occupancylog import OccupancyLogWriter
+from .services import async_setup_services
+from .store import FleetStateStore
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from homeassistant.config_entries import ConfigEntry
-    from homeassistant.core import HomeAssistant
+    from homeassistant.core import Event, HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
+
+    from .device import LinptechBluetoothDeviceData
 
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
     Platform.BINARY_SENSOR,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the Linptech BLE integration services and fleet state store."""
+    hass.data[DATA_FLEET_STORE] = FleetStateStore()
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Linptech BLE from a config entry."""
@@ -36,12 +82,69 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # 将 bindkey 从十六进制字符串转换为 bytes
     try:
         bindkey = bytes.fromhex(bindkey_str)
+        fallback_bindkeys = [
+            bytes.fromhex(key) for key in entry.options.get(CONF_FALLBACK_BINDKEYS, [])
+        ]
     except ValueError:
         # 与 HA core xiaomi_ble 类似，仅在配置错误时记录错误日志
         LOGGER.error("Invalid bindkey format for Linptech BLE device %s", address)
         return False
 
-    device_data = LinptechBluetoothDeviceData(bindkey=bindkey)
+    # PassiveBluetoothProcessorEntity 以 ("bluetooth", "<地址>-<device_id>")
+    # 注册设备；设备在第一个实体添加后才存在，找到后缓存其 ID
+    device_identifier = (BLUETOOTH_DOMAIN, f"{address}-{address.lower()}")
+    device_id: str | None = None
+
+    @callback
+    def _async_device_id() -> str | None:
+        """Return the registry ID of the entry's device (cached once found)."""
+        nonlocal device_id
+        if device_id is None:
+            registry = dr.async_get(hass)
+            device = registry.async_get_device(identifiers={device_identifier})
+            if device is None and (
+                devices := dr.async_entries_for_config_entry(registry, entry.entry_id)
+            ):
+                device = devices[0]
+            device_id = device.id if device else None
+        return device_id
+
+    @callback
+    def _async_fire_occupancy(
+        address: str,
+        occupied: bool,  # noqa: FBT001
+        frame_time: float,
+    ) -> None:
+        """Fire an occupancy event straight from the decoder."""
+        hass.bus.async_fire(
+            EVENT_OCCUPANCY,
+            {
+                CONF_DEVICE_ID: _async_device_id(),
+                CONF_ADDRESS: address,
+                CONF_TYPE: TRIGGER_OCCUPIED if occupied else TRIGGER_VACATED,
+                ATTR_MONOTONIC_TIME: frame_time,
+            },
+        )
+
+    device_data, detach = create_device_data(
+        address,
+        bindkey,
+        hass.data[DATA_FLEET_STORE],
+        occupancy_callback=_async_fire_occupancy,
+        fallback_bindkeys=fallback_bindkeys,
+    )
+    entry.async_on_unload(detach)
+
+    if entry.options.get(CONF_OCCUPANCY_LOG):
+        await _async_setup_occupancy_log(hass, entry, device_data)
+
+    if entry.options.get(CONF_LONG_TERM_STATISTICS):
+        if "recorder" in hass.config.components:
+            await async_setup_long_term_statistics(hass, entry, device_data)
+        else:
+            LOGGER.warning(
+                "Long-term statistics for %s need the recorder integration", address
+            )
 
     coordinator = PassiveBluetoothProcessorCoordinator(
         hass,
@@ -56,7 +159,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     coordinator.sleepy_device = True
 
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    hass.data[DOMAIN][entry.entry_id] = LinptechBleData(
+        coordinator=coordinator, device_data=device_data
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -69,6 +174,41 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def _async_setup_occupancy_log(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    device_data: LinptechBluetoothDeviceData,
+) -> None:
+    """Append occupancy transitions to the device's binary occupancy log."""
+    address = entry.data[CONF_ADDRESS]
+    writer = OccupancyLogWriter(
+        Path(hass.config.path(DOMAIN, f"{address.replace(':', '').lower()}.occ")),
+        address,
+    )
+    await hass.async_add_executor_job(writer.open)
+
+    # 事件循环中只写入内存缓冲区，文件写入与 fsync 定期在执行器中完成
+    lock = asyncio.Lock()
+
+    async def _async_flush(_now: datetime | Event | None = None) -> None:
+        async with lock:
+            await hass.async_add_executor_job(writer.write, writer.take_pending())
+
+    entry.async_on_unload(
+        device_data.add_update_listener(
+            lambda update: writer.observe(update, int(time.time() * 1000))
+        )
+    )
+    entry.async_on_unload(
+        async_track_time_interval(hass, _async_flush, OCCUPANCY_LOG_FLUSH_INTERVAL)
+    )
+    entry.async_on_unload(_async_flush)
+    # 关闭 Home Assistant 时不会卸载配置条目，需要在最终写入阶段再刷新一次
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, _async_flush)
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
@@ -0,0 +1,145 @@
+"""
+Command line entry point of the headless Linptech BLE daemon.
+
+Example::
+
+    python -m linptech_ble --bindkeys keys.csv --ble --mqtt localhost
+
+``python -m`` imports the integration package and therefore Home Assistant;
+``scripts/daemon`` runs the same entry point without it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import sys
+from pathlib import Path
+
+from .bindkeys import parse_bindkey_file
+from .daemon import (
+    BleakSource,
+    Daemon,
+    MqttSink,
+    ReplaySource,
+    Sink,
+    Source,
+    StdoutSink,
+    TcpJsonlSource,
+)
+
+
+def _host_port(value: str, default_port: int) -> tuple[str, int]:
+    """Split ``host[:port]``."""
+    if value.isdigit():
+        return "0.0.0.0", int(value)  # noqa: S104
+    host, _, port = value.partition(":")
+    return host, int(port) if port else default_port
+
+
+def _parse_args(argv: list[str] | None, prog: str) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Decode Linptech BLE advertisements without Home Assistant.",
+    )
+    parser.add_argument(
+        "--bindkeys",
+        type=Path,
+        required=True,
+        help="bindkey file (JSON, CSV or token extractor output)",
+    )
+    parser.add_argument(
+        "--ble",
+        nargs="?",
+        const="",
+        metavar="ADAPTER",
+        help="scan with the local Bluetooth adapter (e.g. hci0)",
+    )
+    parser.add_argument(
+        "--replay", type=Path, action="append", default=[], help="replay a JSONL file"
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=0.0,
+        help="replay speed, 1 = real time, 0 = as fast as possible "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--listen",
+        metavar="[HOST:]PORT",
+        help="accept raw advert JSON lines from proxies over TCP",
+    )
+    parser.add_argument(
+        "--mqtt", metavar="HOST[:PORT]", help="publish records to an MQTT broker"
+    )
+    parser.add_argument(
+        "--mqtt-prefix",
+        default="linptech_ble",
+        help="MQTT topic prefix (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-stdout", action="store_true", help="do not write records to stdout"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=1024,
+        help="capacity of the input and per-sink queues (default: %(default)s)",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logging")
+    args = parser.parse_args(argv)
+    if args.ble is None and not args.replay and not args.listen:
+        parser.error("at least one of --ble, --replay or --listen is required")
+    if args.no_stdout and not args.mqtt:
+        parser.error("--no-stdout requires --mqtt")
+    return args
+
+
+def _build(args: argparse.Namespace) -> Daemon:
+    """Create the daemon described by ``args``."""
+    bindkeys, rejected = parse_bindkey_file(args.bindkeys.read_text(encoding="utf-8"))
+    for entry in rejected:
+        logging.getLogger(__package__).warning("Ignoring bindkey entry: %s", entry)
+
+    sources: list[Source] = [
+        ReplaySource(path, args.replay_speed) for path in args.replay
+    ]
+    if args.ble is not None:
+        sources.append(BleakSource(args.ble or None))
+    if args.listen:
+        sources.append(TcpJsonlSource(*_host_port(args.listen, 7654)))
+
+    sinks: list[Sink] = []
+    if not args.no_stdout:
+        sinks.append(StdoutSink())
+    if args.mqtt:
+        sinks.append(MqttSink(*_host_port(args.mqtt, 1883), prefix=args.mqtt_prefix))
+
+    return Daemon(
+        {address: bytes.fromhex(key) for address, key in bindkeys.items()},
+        sources,
+        sinks,
+        queue_size=args.queue_size,
+    )
+
+
+def main(argv: list[str] | None = None, prog: str = "python -m linptech_ble") -> None:
+    """Entry point of the daemon."""
+    args = _parse_args(argv, prog)
+    # 日志写入 stderr，stdout 仅输出 JSON 记录
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    daemon = _build(args)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(daemon.run())
+
+
+if __name__ == "__main__":
+    main()
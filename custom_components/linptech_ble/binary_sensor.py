@@ -18,6 +18,8 @@ from homeassistant.components.bluetooth.passive_update_processor import (
 from homeassistant.helpers.device_registry import DeviceInfo
 
 from .const import DOMAIN, KEY_PRESSURE_STATE, MODEL_PS1BB
+from .entity import LinptechLatencyEntity
+from .latency import STAGE_TRANSFORM
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -84,11 +86,13 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Linptech BLE binary sensors."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data.coordinator
 
-    processor = PassiveBluetoothDataProcessor(
-        binary_sensor_update_to_bluetooth_data_update
-    )
+    transform = binary_sensor_update_to_bluetooth_data_update
+    if (latency := data.device_data.latency) is not None:
+        transform = latency.timed(STAGE_TRANSFORM, transform)
+    processor = PassiveBluetoothDataProcessor(transform)
 
     entry.async_on_unload(
         processor.async_add_entities_listener(
@@ -104,7 +108,7 @@ async def async_setup_entry(
 
 
 class LinptechBluetoothBinarySensorEntity(
-    PassiveBluetoothProcessorEntity, BinarySensorEntity
+    LinptechLatencyEntity, PassiveBluetoothProcessorEntity, BinarySensorEntity
 ):
     """Linptech BLE binary sensor entity."""
 
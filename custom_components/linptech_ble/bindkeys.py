@@ -0,0 +1,148 @@
+"""
+Bindkey file parsing for Linptech BLE.
+
+Supports the formats commonly produced when exporting MiBeacon keys:
+
+* JSON object mapping MAC address to bindkey.
+* JSON list of objects with a MAC field (``mac``/``address``) and a key
+  field (``bindkey``/``beaconkey``/``ble_key``/``key``).
+* CSV with either a header row using the same field names, or plain
+  ``mac,bindkey`` rows.
+* The plain text output of Xiaomi cloud token extractors, where each
+  device block contains ``MAC:`` and ``BLE KEY:`` lines.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import re
+from typing import Any
+
+MAC_RE = re.compile(r"^([0-9A-F]{2}:){5}[0-9A-F]{2}$")
+BINDKEY_RE = re.compile(r"^[0-9A-Fa-f]{32}$")
+
+_MAC_FIELDS = ("mac", "address", "mac_address")
+_KEY_FIELDS = ("bindkey", "beaconkey", "beacon_key", "ble_key", "blekey", "key")
+
+_TEXT_MAC_RE = re.compile(r"^\s*MAC\s*:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+_TEXT_KEY_RE = re.compile(r"^\s*BLE[ _]?KEY\s*:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+
+
+def normalize_address(address: str) -> str | None:
+    """Return the address as ``AA:BB:CC:DD:EE:FF`` or ``None`` if invalid."""
+    address = address.strip().upper().replace("-", ":")
+    if len(address) == 12 and ":" not in address:  # noqa: PLR2004
+        address = ":".join(address[i : i + 2] for i in range(0, 12, 2))
+    return address if MAC_RE.match(address) else None
+
+
+def normalize_bindkey(bindkey: str) -> str | None:
+    """Return the bindkey as 32 lowercase hex chars or ``None`` if invalid."""
+    bindkey = bindkey.strip()
+    return bindkey.lower() if BINDKEY_RE.match(bindkey) else None
+
+
+def parse_bindkey_file(content: str) -> tuple[dict[str, str], list[str]]:
+    """
+    Parse a bindkey file into a MAC -> bindkey mapping.
+
+    Returns ``(bindkeys, rejected)`` where ``rejected`` lists the raw MAC
+    addresses (or row descriptions) that could not be used. When the
+    same MAC appears more than once the last entry wins.
+    """
+    content = content.strip().lstrip("\ufeff")
+    if not content:
+        return {}, []
+
+    if content[0] in "[{":
+        try:
+            pairs = _pairs_from_json(json.loads(content))
+        except ValueError:
+            pairs = []
+    elif _TEXT_MAC_RE.search(content) and _TEXT_KEY_RE.search(content):
+        pairs = _pairs_from_text(content)
+    else:
+        pairs = _pairs_from_csv(content)
+
+    bindkeys: dict[str, str] = {}
+    rejected: list[str] = []
+    for raw_mac, raw_key in pairs:
+        address = normalize_address(raw_mac)
+        bindkey = normalize_bindkey(raw_key)
+        if address is None or bindkey is None:
+            rejected.append(raw_mac.strip() or "?")
+            continue
+        bindkeys[address] = bindkey
+
+    return bindkeys, rejected
+
+
+def _pick(row: dict[str, Any], fields: tuple[str, ...]) -> str | None:
+    """Return the first non-empty value of ``fields`` in ``row``."""
+    lowered = {str(k).strip().lower(): v for k, v in row.items()}
+    for field in fields:
+        value = lowered.get(field)
+        if value:
+            return str(value)
+    return None
+
+
+def _pairs_from_json(data: Any) -> list[tuple[str, str]]:
+    """Extract (mac, key) pairs from decoded JSON."""
+    if isinstance(data, dict):
+        # 兼容 {"devices": [...]} 这类包装结构
+        for value in data.values():
+            if isinstance(value, list):
+                return _pairs_from_json(value)
+        return [(str(k), str(v)) for k, v in data.items() if isinstance(v, str)]
+
+    pairs: list[tuple[str, str]] = []
+    if isinstance(data, list):
+        for row in data:
+            if not isinstance(row, dict):
+                continue
+            mac = _pick(row, _MAC_FIELDS)
+            key = _pick(row, _KEY_FIELDS)
+            if mac is not None and key is not None:
+                pairs.append((mac, key))
+    return pairs
+
+
+def _pairs_from_csv(content: str) -> list[tuple[str, str]]:
+    """Extract (mac, key) pairs from CSV, with or without a header row."""
+    try:
+        dialect = csv.Sniffer().sniff(content[:1024], delimiters=",;\t ")
+    except csv.Error:
+        dialect = csv.excel
+
+    rows = [row for row in csv.reader(io.StringIO(content), dialect) if row]
+    if not rows:
+        return []
+
+    header = [cell.strip().lower() for cell in rows[0]]
+    mac_col = next((header.index(f) for f in _MAC_FIELDS if f in header), None)
+    key_col = next((header.index(f) for f in _KEY_FIELDS if f in header), None)
+    if mac_col is not None and key_col is not None:
+        rows = rows[1:]
+    else:
+        mac_col, key_col = 0, 1
+
+    return [
+        (row[mac_col], row[key_col])
+        for row in rows
+        if len(row) > max(mac_col, key_col) and not row[0].lstrip().startswith("#")
+    ]
+
+
+def _pairs_from_text(content: str) -> list[tuple[str, str]]:
+    """Extract (mac, key) pairs from token extractor text output."""
+    pairs: list[tuple[str, str]] = []
+    # 每个设备块以空行分隔；块内同时包含 MAC 与 BLE KEY 才视为有效
+    for block in re.split(r"\n\s*\n|\n\s*-{3,}\s*\n", content):
+        mac = _TEXT_MAC_RE.search(block)
+        key = _TEXT_KEY_RE.search(block)
+        if mac and key:
+            pairs.append((mac.group(1), key.group(1)))
+    return pairs
@@ -2,21 +2,52 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.components.bluetooth import async_last_service_info
+from homeassistant.components.file_upload import process_uploaded_file
 from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 
-from .const import CONF_BINDKEY, DOMAIN, LOGGER
+from .bindkeys import normalize_bindkey, parse_bindkey_file
+from .const import (
+    CONF_BINDKEY,
+    CONF_BINDKEY_FILE,
+    CONF_FALLBACK_BINDKEYS,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_OCCUPANCY_LOG,
+    DOMAIN,
+    LOGGER,
+)
+from .device import LinptechBluetoothDeviceData
 
 if TYPE_CHECKING:
     from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+    from homeassistant.core import HomeAssistant
     from homeassistant.data_entry_flow import FlowResult
 
 
+def _verify_bindkey(
+    bindkey: str, service_info: BluetoothServiceInfoBleak | None
+) -> bool | None:
+    """Verify a hex bindkey against an advertisement (runs in the executor)."""
+    if service_info is None:
+        return None
+    device_data = LinptechBluetoothDeviceData(bindkey=bytes.fromhex(bindkey))
+    return device_data.verify_bindkey(service_info)
+
+
+def _read_uploaded_file(hass: HomeAssistant, file_id: str) -> str:
+    """Read an uploaded bindkey file (runs in the executor)."""
+    with process_uploaded_file(hass, file_id) as file_path:
+        return file_path.read_text(encoding="utf-8", errors="replace")
+
+
 class LinptechBleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Linptech BLE."""
 
@@ -27,10 +58,28 @@ class LinptechBleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._discovery_info: BluetoothServiceInfoBleak | None = None
         self._discovered_address: str | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> LinptechBleOptionsFlow:
+        """Get the options flow for this handler."""
+        return LinptechBleOptionsFlow()
+
     async def async_step_user(
+        self,
+        user_input: dict[str, Any] | None = None,  # noqa: ARG002
+    ) -> FlowResult:
+        """Let the user choose between manual setup and bulk import."""
+        return self.async_show_menu(
+            step_id="user",
+            menu_options=["manual", "bulk_import"],
+        )
+
+    async def async_step_manual(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the user step to add a device manually."""
+        """Handle the manual step to add a single device."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
@@ -41,6 +90,17 @@ class LinptechBleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             # 验证 bindkey 格式(32 位十六进制)
             elif not re.match(r"^[0-9A-Fa-f]{32}$", user_input[CONF_BINDKEY]):
                 errors["base"] = "invalid_bindkey"
+            elif (
+                await self.hass.async_add_executor_job(
+                    _verify_bindkey,
+                    user_input[CONF_BINDKEY],
+                    async_last_service_info(self.hass, address, connectable=False),
+                )
+                is False
+            ):
+                # 仅在已有缓存广播且解密失败时报错；
+                # 尚未收到广播时无法校验，直接放行。
+                errors["base"] = "bindkey_verification_failed"
             else:
                 # 设置 unique_id 为 MAC 地址
                 await self.async_set_unique_id(address)
@@ -78,7 +138,7 @@ class LinptechBleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=data_schema,
             errors=errors,
         )
@@ -110,6 +170,13 @@ class LinptechBleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             # 验证 bindkey 格式
             if not re.match(r"^[0-9A-Fa-f]{32}$", user_input[CONF_BINDKEY]):
                 errors["base"] = "invalid_bindkey"
+            elif (
+                await self.hass.async_add_executor_job(
+                    _verify_bindkey, user_input[CONF_BINDKEY], self._discovery_info
+                )
+                is False
+            ):
+                errors["base"] = "bindkey_verification_failed"
             else:
                 # 创建配置条目
                 return self.async_create_entry(
@@ -139,3 +206,176 @@ class LinptechBleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             },
             errors=errors,
         )
+
+    async def async_step_bulk_import(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """
+        Import many devices at once from an uploaded bindkey file.
+
+        Every bindkey is checked concurrently against the last advertisement
+        cached by the bluetooth manager. Devices whose key fails the check
+        are skipped; devices that have not been seen yet are queued
+        unverified. Each device gets its own entry via the import step.
+        """
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            content = await self.hass.async_add_executor_job(
+                _read_uploaded_file, self.hass, user_input[CONF_BINDKEY_FILE]
+            )
+            bindkeys, rejected = parse_bindkey_file(content)
+
+            if not bindkeys:
+                errors["base"] = "invalid_bindkey_file"
+            else:
+                configured = self._async_current_ids(include_ignore=False)
+                pending = {
+                    address: bindkey
+                    for address, bindkey in bindkeys.items()
+                    if address not in configured
+                }
+                addresses = list(pending)
+
+                # 所有校验并发执行；AES-CCM 本身很快，瓶颈只在调度
+                results = await asyncio.gather(
+                    *(
+                        self.hass.async_add_executor_job(
+                            _verify_bindkey,
+                            pending[address],
+                            async_last_service_info(
+                                self.hass, address, connectable=False
+                            ),
+                        )
+                        for address in addresses
+                    )
+                )
+
+                failed: list[str] = []
+                unverified: list[str] = []
+                for address, verified in zip(addresses, results, strict=True):
+                    if verified is False:
+                        failed.append(address)
+                        continue
+                    if verified is None:
+                        unverified.append(address)
+                    self.hass.async_create_task(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN,
+                            context={"source": config_entries.SOURCE_IMPORT},
+                            data={
+                                CONF_ADDRESS: address,
+                                CONF_BINDKEY: pending[address],
+                            },
+                        )
+                    )
+
+                LOGGER.debug(
+                    "Bulk import: %d queued (%d unverified), %d failed, "
+                    "%d already configured, %d rejected",
+                    len(addresses) - len(failed),
+                    len(unverified),
+                    len(failed),
+                    len(bindkeys) - len(addresses),
+                    len(rejected),
+                )
+
+                return self.async_abort(
+                    reason="bulk_import_finished",
+                    description_placeholders={
+                        "queued": str(len(addresses) - len(failed)),
+                        "unverified": ", ".join(unverified) or "-",
+                        "failed": ", ".join(failed) or "-",
+                        "skipped": str(len(bindkeys) - len(addresses)),
+                        "rejected": ", ".join(rejected) or "-",
+                    },
+                )
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_BINDKEY_FILE): selector.FileSelector(
+                    selector.FileSelectorConfig(accept=".csv,.json,.txt"),
+                ),
+            }
+        )
+
+        return self.async_show_form(
+            step_id="bulk_import",
+            data_schema=data_schema,
+            errors=errors,
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create an entry for a single device handed over by bulk import."""
+        address = import_data[CONF_ADDRESS]
+
+        await self.async_set_unique_id(address, raise_on_progress=False)
+        self._abort_if_unique_id_configured()
+
+        return self.async_create_entry(
+            title=f"Linptech PS1BB {address[-5:]}",
+            data={
+                CONF_ADDRESS: address,
+                CONF_BINDKEY: import_data[CONF_BINDKEY],
+            },
+        )
+
+
+class LinptechBleOptionsFlow(config_entries.OptionsFlow):
+    """Handle Linptech BLE options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage candidate bindkeys, the occupancy log and statistics import."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            raw_keys = re.split(r"[\s,;]+", user_input.get(CONF_FALLBACK_BINDKEYS, ""))
+            bindkeys = [normalize_bindkey(key) for key in raw_keys if key]
+            if None in bindkeys:
+                errors["base"] = "invalid_bindkey"
+            else:
+                primary = self.config_entry.data[CONF_BINDKEY]
+                return self.async_create_entry(
+                    data={
+                        CONF_FALLBACK_BINDKEYS: [
+                            key for key in dict.fromkeys(bindkeys) if key != primary
+                        ],
+                        CONF_OCCUPANCY_LOG: user_input.get(CONF_OCCUPANCY_LOG, False),
+                        CONF_LONG_TERM_STATISTICS: user_input.get(
+                            CONF_LONG_TERM_STATISTICS, False
+                        ),
+                    },
+                )
+
+        current = "\n".join(self.config_entry.options.get(CONF_FALLBACK_BINDKEYS, []))
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_FALLBACK_BINDKEYS,
+                    default=(user_input or {}).get(CONF_FALLBACK_BINDKEYS, current),
+                ): selector.TextSelector(
+                    selector.TextSelectorConfig(
+                        type=selector.TextSelectorType.TEXT,
+                        multiline=True,
+                    ),
+                ),
+                vol.Optional(
+                    CONF_OCCUPANCY_LOG,
+                    default=self.config_entry.options.get(CONF_OCCUPANCY_LOG, False),
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_LONG_TERM_STATISTICS,
+                    default=self.config_entry.options.get(
+                        CONF_LONG_TERM_STATISTICS, False
+                    ),
+                ): selector.BooleanSelector(),
+            }
+        )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=data_schema,
+            errors=errors,
+        )
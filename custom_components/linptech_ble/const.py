@@ -1,5 +1,6 @@
 """Constants for linptech_ble."""
 
+from datetime import timedelta
 from logging import Logger, getLogger
 
 LOGGER: Logger = getLogger(__package__)
@@ -8,6 +9,27 @@ DOMAIN = "linptech_ble"
 
 # 配置键
 CONF_BINDKEY = "bindkey"
+CONF_BINDKEY_FILE = "bindkey_file"
+# 额外的候选 bindkey(设备重新配对后 bindkey 会变化)
+CONF_FALLBACK_BINDKEYS = "fallback_bindkeys"
+
+# 是否将占用状态变化写入追加式二进制日志，每个设备一个文件
+CONF_OCCUPANCY_LOG = "occupancy_log"
+OCCUPANCY_LOG_FLUSH_INTERVAL = timedelta(seconds=60)
+
+# 是否由集成自行按小时汇总并导入长期统计，即外部统计
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+
+# 已验证的 bindkey 连续解密失败多少帧后才尝试其他候选 bindkey
+BINDKEY_FALLBACK_FAILURES = 3
+
+# 全部设备最新状态的列式存储(hass.data 键)
+DATA_FLEET_STORE = f"{DOMAIN}_fleet_store"
+
+# 诊断信息中为每个设备保留的最近原始帧数量
+FRAME_LOG_SIZE = 64
+# 每个处理阶段保留的最近延迟样本数量
+LATENCY_SAMPLES = 256
 
 # 数据对象 ID(来自 ble_monitor issue #1367 等公开资料)
 OBJECT_ID_PRESSURE_STATE = 0x483C
@@ -35,3 +57,14 @@ KEY_PRESSURE_PRESENT_TIME_SET = "pressure_present_time_set"
 KEY_PRESSURE_NOT_PRESENT_TIME_SET = "pressure_not_present_time_set"
 KEY_BATTERY = "battery"
 KEY_RSSI = "rssi"
+KEY_PACKET_LOSS = "packet_loss"
+KEY_INTERVAL_MEAN = "interval_mean"
+KEY_INTERVAL_JITTER = "interval_jitter"
+KEY_ADVERTS_PER_MINUTE = "adverts_per_minute"
+KEY_LATENCY = "latency"
+
+# 占用事件与设备触发器
+EVENT_OCCUPANCY = f"{DOMAIN}_occupancy"
+ATTR_MONOTONIC_TIME = "monotonic_time"
+TRIGGER_OCCUPIED = "occupied"
+TRIGGER_VACATED = "vacated"
@@ -0,0 +1,391 @@
+"""
+Headless advertisement decoder for Linptech BLE.
+
+Runs the same :class:`LinptechBluetoothDeviceData` decoder as the Home
+Assistant integration, but fed from pluggable sources and writing to
+pluggable sinks, so small gateways can decode many sensors without a Home
+Assistant instance. See ``__main__.py`` for the command line and
+``scripts/daemon`` for running it without Home Assistant installed.
+
+Pipeline and backpressure:
+
+* Sources put :class:`Advert` objects on one bounded input queue. Replay and
+  TCP sources await free space, which throttles the file reader or the TCP
+  peer. The BLE scanner callback cannot wait, so when the queue is full it
+  drops the oldest queued advert to make room and counts it.
+* A single decode task runs the per-address decoders in arrival order.
+* Every sink has its own bounded queue. When a sink falls behind the oldest
+  record is dropped (sensor state is latest-wins), so a slow broker never
+  stalls decoding or the other sinks.
+
+Raw adverts are exchanged as JSON lines (replay files and the TCP feed)::
+
+    {"address": "A4:C1:38:00:00:01", "rssi": -60, "time": 12.5,
+     "service_data": {"0000fe95-0000-1000-8000-00805f9b34fb": "5858..."}}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .const import LOGGER
+from .device import MI_SERVICE_UUID, LinptechBluetoothDeviceData
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# 运行期间记录统计计数器的周期，单位秒
+STATS_INTERVAL = 60.0
+
+
+@dataclass(slots=True)
+class Advert:
+    """A raw advertisement; duck-types ``BluetoothServiceInfoBleak``."""
+
+    address: str
+    rssi: int | None
+    service_data: dict[str, bytes]
+    time: float = field(default_factory=time.monotonic)
+
+
+def advert_from_json(line: str | bytes) -> Advert | None:
+    """Parse one JSON line of the raw advert format, or ``None`` if invalid."""
+    try:
+        data = json.loads(line)
+        timestamp = data.get("time")
+        return Advert(
+            address=str(data["address"]).upper(),
+            rssi=data.get("rssi"),
+            service_data={
+                uuid: bytes.fromhex(payload)
+                for uuid, payload in data["service_data"].items()
+            },
+            time=time.monotonic() if timestamp is None else float(timestamp),
+        )
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+class Source:
+    """Base class of advert sources."""
+
+    name = "source"
+    # 因队列已满而丢弃的广播数量；只有不能等待的输入源才会丢弃
+    dropped = 0
+
+    async def run(self, queue: asyncio.Queue[Advert]) -> None:
+        """Produce adverts into ``queue`` until cancelled or exhausted."""
+        raise NotImplementedError
+
+
+class BleakSource(Source):
+    """Passive scanning with the local Bluetooth adapter via ``bleak``."""
+
+    name = "ble"
+
+    def __init__(self, adapter: str | None = None) -> None:
+        """Initialize the source."""
+        self._adapter = adapter
+        self.dropped = 0
+
+    async def run(self, queue: asyncio.Queue[Advert]) -> None:
+        """Scan until cancelled."""
+        from bleak import BleakScanner  # noqa: PLC0415
+
+        def _detected(device: Any, adv: Any) -> None:
+            payload = adv.service_data.get(MI_SERVICE_UUID)
+            if payload is None:
+                return
+            if queue.full():
+                # 扫描回调不能阻塞，队列满时丢弃最旧的广播并计数
+                queue.get_nowait()
+                queue.task_done()
+                self.dropped += 1
+            queue.put_nowait(
+                Advert(device.address, adv.rssi, {MI_SERVICE_UUID: payload})
+            )
+
+        kwargs: dict[str, Any] = {"detection_callback": _detected}
+        if self._adapter:
+            kwargs["adapter"] = self._adapter
+        async with BleakScanner(**kwargs):
+            await asyncio.Event().wait()
+
+
+class ReplaySource(Source):
+    """Replays a JSONL file of raw adverts, optionally in real time."""
+
+    name = "replay"
+
+    def __init__(self, path: Path, speed: float = 0.0) -> None:
+        """
+        Initialize the source.
+
+        ``speed`` scales the recorded inter-arrival times (1.0 = real time);
+        ``0`` replays as fast as the pipeline accepts. Adverts keep their
+        recorded times, shifted to the monotonic clock, so link statistics
+        describe the recorded link at any speed.
+        """
+        self._path = path
+        self._speed = speed
+
+    async def run(self, queue: asyncio.Queue[Advert]) -> None:
+        """Replay the file once."""
+        loop = asyncio.get_running_loop()
+        lines = await loop.run_in_executor(None, self._read_lines)
+        first: float | None = None
+        start = time.monotonic()
+        for line in lines:
+            advert = advert_from_json(line)
+            if advert is None:
+                continue
+            first = advert.time if first is None else first
+            if self._speed > 0:
+                delay = (advert.time - first) / self._speed - (time.monotonic() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            # 保留记录中的时间间隔，只将第一帧对齐到回放开始的单调时钟
+            advert.time += start - first
+            await queue.put(advert)
+
+    def _read_lines(self) -> list[str]:
+        """Read the replay file (runs in the executor)."""
+        return self._path.read_text(encoding="utf-8").splitlines()
+
+
+class TcpJsonlSource(Source):
+    """Accepts raw advert JSON lines from proxies over TCP."""
+
+    name = "tcp"
+
+    def __init__(self, host: str, port: int) -> None:
+        """Initialize the source."""
+        self._host = host
+        self._port = port
+
+    async def run(self, queue: asyncio.Queue[Advert]) -> None:
+        """Serve until cancelled."""
+
+        async def _handle(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            peer = writer.get_extra_info("peername")
+            LOGGER.info("Proxy connected: %s", peer)
+            try:
+                while line := await reader.readline():
+                    if (advert := advert_from_json(line)) is not None:
+                        # 队列满时在此等待，不再读取 socket，由 TCP 流控反压对端
+                        await queue.put(advert)
+            finally:
+                writer.close()
+                LOGGER.info("Proxy disconnected: %s", peer)
+
+        server = await asyncio.start_server(_handle, self._host, self._port)
+        async with server:
+            await server.serve_forever()
+
+
+class Sink:
+    """Base class of record sinks."""
+
+    name = "sink"
+
+    async def start(self) -> None:
+        """Prepare the sink (connect, open files)."""
+
+    async def send(self, record: dict[str, Any]) -> None:
+        """Deliver one record."""
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        """Release resources."""
+
+
+class StdoutSink(Sink):
+    """Writes records as JSON lines to stdout."""
+
+    name = "stdout"
+
+    async def send(self, record: dict[str, Any]) -> None:
+        """Write one record."""
+        sys.stdout.write(json.dumps(record, separators=(",", ":")) + "\n")
+        sys.stdout.flush()
+
+
+class MqttSink(Sink):
+    """
+    Publishes records to an MQTT broker (requires ``aiomqtt``).
+
+    Updates go to ``<prefix>/<mac>/state`` and occupancy transitions to
+    ``<prefix>/<mac>/occupancy``, where ``<mac>`` has no separators.
+    """
+
+    name = "mqtt"
+
+    def __init__(
+        self, host: str, port: int = 1883, prefix: str = "linptech_ble"
+    ) -> None:
+        """Initialize the sink."""
+        self._host = host
+        self._port = port
+        self._prefix = prefix.rstrip("/")
+        self._client: Any = None
+        self._stack = contextlib.AsyncExitStack()
+
+    async def start(self) -> None:
+        """Connect to the broker."""
+        try:
+            import aiomqtt  # noqa: PLC0415
+        except ImportError as err:
+            msg = "The MQTT sink requires the 'aiomqtt' package"
+            raise RuntimeError(msg) from err
+        self._client = await self._stack.enter_async_context(
+            aiomqtt.Client(self._host, self._port)
+        )
+
+    async def send(self, record: dict[str, Any]) -> None:
+        """Publish one record."""
+        mac = record["address"].replace(":", "").lower()
+        topic = f"{self._prefix}/{mac}/{record['type']}"
+        await self._client.publish(topic, json.dumps(record, separators=(",", ":")))
+
+    async def stop(self) -> None:
+        """Disconnect from the broker."""
+        await self._stack.aclose()
+
+
+@dataclass
+class DaemonStats:
+    """Pipeline counters, logged every ``STATS_INTERVAL`` and on shutdown."""
+
+    adverts: int = 0
+    unknown: int = 0
+    updates: int = 0
+    errors: int = 0
+    source_dropped: dict[str, int] = field(default_factory=dict)
+    sink_dropped: dict[str, int] = field(default_factory=dict)
+
+
+class Daemon:
+    """Wires sources, per-address decoders and sinks together."""
+
+    def __init__(
+        self,
+        bindkeys: dict[str, bytes],
+        sources: list[Source],
+        sinks: list[Sink],
+        queue_size: int = 1024,
+    ) -> None:
+        """Initialize the daemon with a MAC -> bindkey mapping."""
+        self.stats = DaemonStats()
+        self._sources = sources
+        self._sinks = sinks
+        self._input: asyncio.Queue[Advert] = asyncio.Queue(queue_size)
+        self._outputs: list[asyncio.Queue[dict[str, Any]]] = [
+            asyncio.Queue(queue_size) for _ in sinks
+        ]
+        self._decoders = {
+            address: LinptechBluetoothDeviceData(
+                bindkey=bindkey, occupancy_callback=self._on_occupancy
+            )
+            for address, bindkey in bindkeys.items()
+        }
+
+    async def run(self) -> None:
+        """Run until all sources are exhausted or the task is cancelled."""
+        for sink in self._sinks:
+            await sink.start()
+
+        decode = asyncio.create_task(self._decode())
+        deliver = [
+            asyncio.create_task(self._deliver(sink, queue))
+            for sink, queue in zip(self._sinks, self._outputs, strict=True)
+        ]
+        report = asyncio.create_task(self._report())
+        try:
+            await asyncio.gather(*(source.run(self._input) for source in self._sources))
+            # 所有输入源结束后，等待队列中的数据处理完毕
+            await self._input.join()
+            for queue in self._outputs:
+                await queue.join()
+        finally:
+            for task in (decode, *deliver, report):
+                task.cancel()
+            for sink in self._sinks:
+                await sink.stop()
+            LOGGER.info("Stopped: %s", self._collect_stats())
+
+    def _collect_stats(self) -> DaemonStats:
+        """Return the counters, including the drops of the sources."""
+        for source in self._sources:
+            if source.dropped:
+                self.stats.source_dropped[source.name] = source.dropped
+        return self.stats
+
+    async def _report(self) -> None:
+        """Log the counters periodically."""
+        while True:
+            await asyncio.sleep(STATS_INTERVAL)
+            LOGGER.info("Stats: %s", self._collect_stats())
+
+    async def _decode(self) -> None:
+        """Decode adverts in arrival order."""
+        while True:
+            advert = await self._input.get()
+            self.stats.adverts += 1
+            try:
+                decoder = self._decoders.get(advert.address)
+                if decoder is None:
+                    self.stats.unknown += 1
+                elif (update := decoder.update(advert)) is not None:
+                    self.stats.updates += 1
+                    record = asdict(update)
+                    record["type"] = "state"
+                    record["time"] = time.time()
+                    self._publish(record)
+            except Exception:  # noqa: BLE001
+                # 单个广播解码失败不能终止解码任务，否则 run() 会一直等待队列
+                self.stats.errors += 1
+                LOGGER.exception("Failed to decode advert from %s", advert.address)
+            finally:
+                self._input.task_done()
+
+    def _on_occupancy(self, address: str, occupied: bool, frame_time: float) -> None:  # noqa: FBT001
+        """Publish occupancy transitions from the decode path."""
+        self._publish(
+            {
+                "type": "occupancy",
+                "address": address,
+                "occupied": occupied,
+                "monotonic_time": frame_time,
+                "time": time.time(),
+            }
+        )
+
+    def _publish(self, record: dict[str, Any]) -> None:
+        """Hand a record to every sink, dropping the oldest when one is full."""
+        for sink, queue in zip(self._sinks, self._outputs, strict=True):
+            if queue.full():
+                queue.get_nowait()
+                queue.task_done()
+                self.stats.sink_dropped[sink.name] = (
+                    self.stats.sink_dropped.get(sink.name, 0) + 1
+                )
+            queue.put_nowait(record)
+
+    async def _deliver(self, sink: Sink, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        """Feed one sink from its queue."""
+        while True:
+            record = await queue.get()
+            try:
+                await sink.send(record)
+            except Exception:  # noqa: BLE001
+                LOGGER.exception("Sink %s failed to deliver a record", sink.name)
+            finally:
+                queue.task_done()
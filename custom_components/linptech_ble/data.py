@@ -0,0 +1,21 @@
+"""Runtime data for the Linptech BLE integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from homeassistant.components.bluetooth.passive_update_processor import (
+        PassiveBluetoothProcessorCoordinator,
+    )
+
+    from .device import LinptechBluetoothDeviceData
+
+
+@dataclass
+class LinptechBleData:
+    """Per config entry runtime data stored in ``hass.data[DOMAIN]``."""
+
+    coordinator: PassiveBluetoothProcessorCoordinator
+    device_data: LinptechBluetoothDeviceData
@@ -10,10 +10,14 @@ reimplementation (no code is copied).
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from .const import (
+    BINDKEY_FALLBACK_FAILURES,
+    FRAME_LOG_SIZE,
+    LATENCY_SAMPLES,
     LOGGER,
     OBJECT_ID_BATTERY,
     OBJECT_ID_PRESSURE_NOT_PRESENT_DURATION,
@@ -23,11 +27,28 @@ from .const import (
     OBJECT_ID_PRESSURE_STATE,
     SUPPORTED_PRODUCT_IDS,
 )
+from .framelog import (
+    RESULT_DECODED,
+    RESULT_DECRYPT_FAILED,
+    RESULT_EMPTY,
+    RESULT_IGNORED,
+    RESULT_NO_BINDKEY,
+    FrameLog,
+)
+from .latency import STAGE_DECRYPT, STAGE_DISPATCH, STAGE_UPDATE, LatencyTracker
+from .linkstats import LinkStats
 from .mibeacon import decrypt_mibeacon_v4_v5
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
     from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
 
+    from .store import FleetStateStore
+
+    # (address, occupied, monotonic frame arrival time)
+    OccupancyCallback = Callable[[str, bool, float], None]
+
 MI_SERVICE_UUID = "0000fe95-0000-1000-8000-00805f9b34fb"
 
 # Frame control bit masks (see public MiBeacon documentation)
@@ -49,14 +70,92 @@ class LinptechUpdate:
     pressure_present_time_set: int | None = None
     pressure_not_present_time_set: int | None = None
     rssi: int | None = None
+    # 链路质量统计(由 LinkStats 增量计算)
+    packet_loss: float | None = None
+    interval_mean: float | None = None
+    interval_jitter: float | None = None
+    adverts_per_minute: float | None = None
+    # 端到端延迟(接收广播到实体状态写入)的 95 百分位，单位毫秒
+    latency_p95: float | None = None
+
+
+def create_device_data(
+    address: str,
+    bindkey: bytes | None,
+    store: FleetStateStore,
+    *,
+    occupancy_callback: OccupancyCallback | None = None,
+    fallback_bindkeys: Sequence[bytes] = (),
+) -> tuple[LinptechBluetoothDeviceData, Callable[[], None]]:
+    """
+    Create the decoder of one configured device as the integration runs it.
+
+    The decoder gets a frame log, a latency tracker and a slot in the fleet
+    state store that every decoded update is written to. Returns the decoder
+    and a callable that detaches it from the store again.
+    """
+    device_data = LinptechBluetoothDeviceData(
+        bindkey=bindkey,
+        occupancy_callback=occupancy_callback,
+        frame_log=FrameLog(FRAME_LOG_SIZE),
+        fallback_bindkeys=fallback_bindkeys,
+        latency=LatencyTracker(LATENCY_SAMPLES),
+    )
+
+    # 所有设备共享一个列式状态存储，供全局查询使用
+    slot = store.add(address)
+    remove_listener = device_data.add_update_listener(
+        lambda update: store.record(slot, update, device_data.link_stats)
+    )
+
+    def _detach() -> None:
+        remove_listener()
+        store.remove(address)
+
+    return device_data, _detach
 
 
 class LinptechBluetoothDeviceData:
     """Linptech device data parser using a local MiBeacon decoder."""
 
-    def __init__(self, bindkey: bytes | None = None) -> None:
-        """Initialize the Linptech device data."""
-        self._bindkey = bindkey
+    def __init__(
+        self,
+        bindkey: bytes | None = None,
+        occupancy_callback: OccupancyCallback | None = None,
+        frame_log: FrameLog | None = None,
+        fallback_bindkeys: Sequence[bytes] = (),
+        latency: LatencyTracker | None = None,
+    ) -> None:
+        """
+        Initialize the Linptech device data.
+
+        ``fallback_bindkeys`` are additional candidate keys, e.g. for a device
+        that has been re-paired. Candidates are only tried until one verifies;
+        the winner is then used alone, and the others are tried again only
+        after ``BINDKEY_FALLBACK_FAILURES`` consecutive failed frames.
+        ``occupancy_callback`` is invoked synchronously from the decoder as
+        soon as a pressure state transition is seen, before the update is
+        handed to the entity processors. ``frame_log`` records every frame
+        for the diagnostics download and ``latency`` collects per-stage
+        pipeline latencies.
+        """
+        # 候选 bindkey 列表(去重并保持顺序)，第一个为配置条目中的主 bindkey
+        self._bindkeys: list[bytes] = list(
+            dict.fromkeys(key for key in (bindkey, *fallback_bindkeys) if key)
+        )
+        # 当前使用的 bindkey；正常情况下每帧只做一次 AES-CCM
+        self._bindkey = self._bindkeys[0] if self._bindkeys else None
+        self._bindkey_verified = False
+        self._bindkey_failures = 0
+        self._occupancy_callback = occupancy_callback
+        self.frame_log = frame_log
+        self.latency = latency
+        self.link_stats = LinkStats()
+        self._update_listeners: list[Callable[[LinptechUpdate], None]] = []
+        # 上一次解析出的压力状态，用于检测占用状态变化
+        self._pressure_state: bool | None = None
+        # 当前正在解析的帧的到达时间，使用单调时钟
+        self._frame_time: float = 0.0
 
     def update(self, service_info: BluetoothServiceInfoBleak) -> LinptechUpdate | None:
         """
@@ -67,48 +166,59 @@ class LinptechBluetoothDeviceData:
         It is responsible for parsing the MiBeacon v4/v5 frame, optionally
         decrypting the payload, and extracting the Linptech specific objects.
         """
-        # Service Data(服务数据 - 小米 BLE 设备通常在这里发送数据)
-        service_data = getattr(service_info, "service_data", {}) or {}
+        start = time.perf_counter_ns()
+        # BluetoothServiceInfoBleak.time 是接收广播时的单调时钟时间
+        self._frame_time = getattr(service_info, "time", None) or time.monotonic()
+        if self.latency is not None:
+            self.latency.record(
+                STAGE_DISPATCH, max(time.monotonic() - self._frame_time, 0.0)
+            )
 
-        # 只处理小米 MiBeacon 服务 UUID 的数据
+        result, update = self._decode(service_info)
+
+        service_data = getattr(service_info, "service_data", None) or {}
         raw = service_data.get(MI_SERVICE_UUID)
-        if raw is None or len(raw) < 5:
-            return None
 
-        frame_ctrl = int.from_bytes(raw[0:2], "little")
-        product_id = int.from_bytes(raw[2:4], "little")
+        # 只有受支持的 Linptech 帧才计入链路质量统计(解密失败的帧同样计入)
+        if result != RESULT_IGNORED:
+            link_stats = self.link_stats
+            link_stats.record(raw[4], self._frame_time)
+            if update is not None:
+                update.packet_loss = link_stats.packet_loss
+                update.interval_mean = link_stats.interval_mean
+                update.interval_jitter = link_stats.interval_jitter
+                update.adverts_per_minute = link_stats.adverts_per_minute
+
+        if self.latency is not None and update is not None:
+            update.latency_p95 = self.latency.end_to_end_p95
+
+        if update is not None:
+            for listener in self._update_listeners:
+                # 单个监听器出错不能影响其他监听器和实体更新
+                try:
+                    listener(update)
+                except Exception:  # noqa: BLE001
+                    LOGGER.exception("Error in update listener for %s", update.address)
+
+        duration = time.perf_counter_ns() - start
+        if self.frame_log is not None:
+            self.frame_log.record(raw, self._frame_time, result, update, duration)
+        if self.latency is not None:
+            self.latency.record(STAGE_UPDATE, duration / 1e9)
+            self.latency.begin_frame(self._frame_time, update is not None)
 
-        # 仅处理当前支持的 Linptech 设备(目前只有 PS1BB)。
-        if product_id not in SUPPORTED_PRODUCT_IDS:
-            LOGGER.debug(
-                "Ignoring non-Linptech device with product ID 0x%04X (address=%s)",
-                product_id,
-                service_info.address,
-            )
-            return None
+        return update
 
-        frame_cnt = raw[4]
-        payload = raw[5:]
+    def _decode(
+        self, service_info: BluetoothServiceInfoBleak
+    ) -> tuple[int, LinptechUpdate | None]:
+        """Decode one advertisement; returns a frame log result code and update."""
+        frame = self._split_frame(service_info)
+        if frame is None:
+            return RESULT_IGNORED, None
 
+        frame_ctrl, product_id, frame_cnt, object_segment = frame
         encrypted = bool(frame_ctrl & FRAMECTRL_ENCRYPTED)
-        has_mac = bool(frame_ctrl & FRAMECTRL_MAC_PRESENT)
-        has_capability = bool(frame_ctrl & FRAMECTRL_CAPABILITY_PRESENT)
-        has_object = bool(frame_ctrl & FRAMECTRL_OBJECT_PRESENT)
-
-        # 先从 payload 中剥离可选的 MAC 和 capability 字段，
-        # 剩余部分才是需要解密(或直接解析)的对象区。
-        header_offset = 0
-        if has_mac and len(payload) >= header_offset + 6:
-            inner_mac = payload[header_offset : header_offset + 6]
-            header_offset += 6
-        if has_capability and len(payload) >= header_offset + 1:
-            capability = payload[header_offset]
-            header_offset += 1
-
-        if not has_object or len(payload) <= header_offset:
-            return None
-
-        object_segment = payload[header_offset:]
 
         if encrypted:
             if not self._bindkey:
@@ -116,8 +226,9 @@ class LinptechBluetoothDeviceData:
                     "Encrypted MiBeacon payload received but no bindkey configured; "
                     "cannot decrypt."
                 )
-                return None
+                return RESULT_NO_BINDKEY, None
 
+            decrypt_start = time.perf_counter()
             decrypted = decrypt_mibeacon_v4_v5(
                 object_segment,
                 bindkey=self._bindkey,
@@ -125,14 +236,24 @@ class LinptechBluetoothDeviceData:
                 product_id=product_id,
                 frame_counter=frame_cnt,
                 frame_ctrl=frame_ctrl,
+                log_failure=len(self._bindkeys) == 1,
             )
+            if decrypted is None:
+                decrypted = self._decrypt_with_fallback(service_info.address, frame)
+            else:
+                self._bindkey_verified = True
+                self._bindkey_failures = 0
+            if self.latency is not None:
+                self.latency.record(STAGE_DECRYPT, time.perf_counter() - decrypt_start)
+
             if decrypted is None:
                 LOGGER.warning("Failed to decrypt MiBeacon payload; ignoring packet")
-                return None
+                return RESULT_DECRYPT_FAILED, None
 
             objects = decrypted
         else:
             objects = object_segment
+
         update = LinptechUpdate(
             address=service_info.address,
             rssi=getattr(service_info, "rssi", None),
@@ -147,9 +268,155 @@ class LinptechBluetoothDeviceData:
             and update.pressure_present_time_set is None
             and update.pressure_not_present_time_set is None
         ):
+            return RESULT_EMPTY, None
+
+        return RESULT_DECODED, update
+
+    def add_update_listener(
+        self, listener: Callable[[LinptechUpdate], None]
+    ) -> Callable[[], None]:
+        """
+        Register a listener called with every decoded update.
+
+        Listeners run synchronously in the decode path and must be cheap.
+        An exception raised by a listener is logged and does not affect the
+        other listeners or the update. Returns a callable that removes the
+        listener.
+        """
+        self._update_listeners.append(listener)
+        return lambda: self._update_listeners.remove(listener)
+
+    @property
+    def active_bindkey_index(self) -> int | None:
+        """Return the index of the bindkey currently used for decryption."""
+        if self._bindkey is None:
             return None
+        return self._bindkeys.index(self._bindkey)
 
-        return update
+    def _decrypt_with_fallback(
+        self, address: str, frame: tuple[int, int, int, bytes]
+    ) -> bytes | None:
+        """
+        Try the other candidate bindkeys after the active one failed.
+
+        Until a key has verified, every failure triggers a sweep; afterwards
+        only sustained failures do, so a single corrupted frame never costs
+        more than one AES-CCM operation per candidate.
+        """
+        self._bindkey_failures += 1
+        if len(self._bindkeys) < 2 or (  # noqa: PLR2004
+            self._bindkey_verified
+            and self._bindkey_failures < BINDKEY_FALLBACK_FAILURES
+        ):
+            return None
+
+        frame_ctrl, product_id, frame_cnt, object_segment = frame
+        for index, candidate in enumerate(self._bindkeys):
+            if candidate is self._bindkey:
+                continue
+            decrypted = decrypt_mibeacon_v4_v5(
+                object_segment,
+                bindkey=candidate,
+                address=address,
+                product_id=product_id,
+                frame_counter=frame_cnt,
+                frame_ctrl=frame_ctrl,
+                log_failure=False,
+            )
+            if decrypted is not None:
+                LOGGER.info(
+                    "Switched %s to candidate bindkey #%d after %d failed frame(s)",
+                    address,
+                    index,
+                    self._bindkey_failures,
+                )
+                self._bindkey = candidate
+                self._bindkey_verified = True
+                self._bindkey_failures = 0
+                return decrypted
+
+        return None
+
+    def verify_bindkey(self, service_info: BluetoothServiceInfoBleak) -> bool | None:
+        """
+        Check the configured bindkeys against a (cached) advertisement.
+
+        Returns ``True`` when the AES-CCM tag verifies with any candidate
+        bindkey, ``False`` when it does not, and ``None`` when the
+        advertisement carries no encrypted Linptech frame that could be used
+        for the check.
+        """
+        frame = self._split_frame(service_info)
+        if frame is None:
+            return None
+
+        frame_ctrl, product_id, frame_cnt, object_segment = frame
+        if not frame_ctrl & FRAMECTRL_ENCRYPTED:
+            return None
+
+        return any(
+            decrypt_mibeacon_v4_v5(
+                object_segment,
+                bindkey=bindkey,
+                address=service_info.address,
+                product_id=product_id,
+                frame_counter=frame_cnt,
+                frame_ctrl=frame_ctrl,
+                log_failure=False,
+            )
+            is not None
+            for bindkey in self._bindkeys
+        )
+
+    def _split_frame(
+        self, service_info: BluetoothServiceInfoBleak
+    ) -> tuple[int, int, int, bytes] | None:
+        """
+        Split a MiBeacon frame into its header fields and object segment.
+
+        Returns ``(frame_ctrl, product_id, frame_cnt, object_segment)`` or
+        ``None`` if the advertisement is not a supported Linptech frame
+        carrying objects.
+        """
+        # Service Data(服务数据 - 小米 BLE 设备通常在这里发送数据)
+        service_data = getattr(service_info, "service_data", {}) or {}
+
+        # 只处理小米 MiBeacon 服务 UUID 的数据
+        raw = service_data.get(MI_SERVICE_UUID)
+        if raw is None or len(raw) < 5:
+            return None
+
+        frame_ctrl = int.from_bytes(raw[0:2], "little")
+        product_id = int.from_bytes(raw[2:4], "little")
+
+        # 仅处理当前支持的 Linptech 设备(目前只有 PS1BB)。
+        if product_id not in SUPPORTED_PRODUCT_IDS:
+            LOGGER.debug(
+                "Ignoring non-Linptech device with product ID 0x%04X (address=%s)",
+                product_id,
+                service_info.address,
+            )
+            return None
+
+        frame_cnt = raw[4]
+        payload = raw[5:]
+
+        has_mac = bool(frame_ctrl & FRAMECTRL_MAC_PRESENT)
+        has_capability = bool(frame_ctrl & FRAMECTRL_CAPABILITY_PRESENT)
+        has_object = bool(frame_ctrl & FRAMECTRL_OBJECT_PRESENT)
+
+        # 先从 payload 中剥离可选的 MAC 和 capability 字段，
+        # 剩余部分才是需要解密(或直接解析)的对象区。
+        header_offset = 0
+        if has_mac and len(payload) >= header_offset + 6:
+            header_offset += 6
+        if has_capability and len(payload) >= header_offset + 1:
+            header_offset += 1
+
+        if not has_object or len(payload) <= header_offset:
+            return None
+
+        return frame_ctrl, product_id, frame_cnt, payload[header_offset:]
 
     def _parse_objects(self, payload: bytes, update: LinptechUpdate) -> None:
         """
@@ -206,6 +473,19 @@ class LinptechBluetoothDeviceData:
             pressure_present = xobj[0] == 1
             update.pressure_state = pressure_present
 
+            # 在解码路径上直接通知占用变化，不必等待实体状态写入；
+            # 首次收到的状态只作为基准，不视为变化。
+            previous = self._pressure_state
+            self._pressure_state = pressure_present
+            if (
+                self._occupancy_callback is not None
+                and previous is not None
+                and previous != pressure_present
+            ):
+                self._occupancy_callback(
+                    update.address, pressure_present, self._frame_time
+                )
+
     def _obj_483D(self, xobj: bytes, update: LinptechUpdate) -> None:
         """Handle Linptech pressure present duration (0x483D)."""
         if len(xobj) >= 4:
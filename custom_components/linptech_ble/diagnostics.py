@@ -0,0 +1,37 @@
+"""Diagnostics support for Linptech BLE."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_ADDRESS
+
+from .const import CONF_BINDKEY, CONF_FALLBACK_BINDKEYS, DATA_FLEET_STORE, DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .data import LinptechBleData
+    from .store import FleetStateStore
+
+TO_REDACT = {CONF_BINDKEY, CONF_FALLBACK_BINDKEYS}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data: LinptechBleData = hass.data[DOMAIN][entry.entry_id]
+    frame_log = data.device_data.frame_log
+    latency = data.device_data.latency
+    store: FleetStateStore = hass.data[DATA_FLEET_STORE]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "active_bindkey_index": data.device_data.active_bindkey_index,
+        "fleet_state": store.get(entry.data[CONF_ADDRESS]),
+        "latency": latency.as_dict() if latency is not None else None,
+        "frame_log": frame_log.as_dict() if frame_log is not None else None,
+    }
@@ -0,0 +1,38 @@
+"""Shared entity behaviour for Linptech BLE."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .latency import LatencyTracker
+
+
+class LinptechLatencyEntity(Entity):
+    """Times state writes for the device's latency tracker."""
+
+    _latency: LatencyTracker | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Look up the latency tracker of the entity's config entry."""
+        await super().async_added_to_hass()
+        if (entry := self.platform.config_entry) is not None and (
+            data := self.hass.data[DOMAIN].get(entry.entry_id)
+        ) is not None:
+            self._latency = data.device_data.latency
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and record how long it took."""
+        if self._latency is None:
+            super().async_write_ha_state()
+            return
+        start = time.perf_counter()
+        super().async_write_ha_state()
+        self._latency.record_write(time.perf_counter() - start)
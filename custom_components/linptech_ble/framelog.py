@@ -0,0 +1,116 @@
+"""
+Fixed-size ring buffer of recent raw MiBeacon frames.
+
+Every advertisement handled by ``LinptechBluetoothDeviceData.update`` is
+recorded here. All storage is preallocated when the buffer is created, and
+recording a frame only stores references and numbers into existing slots,
+so keeping the buffer enabled costs next to nothing in steady state. Hex
+formatting and dict building only happen when a snapshot is requested for
+the diagnostics download.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .device import LinptechUpdate
+
+# 解码结果代码(数组中只保存整数，导出诊断时再转换为名称)
+RESULT_DECODED = 0
+RESULT_IGNORED = 1
+RESULT_NO_BINDKEY = 2
+RESULT_DECRYPT_FAILED = 3
+RESULT_EMPTY = 4
+
+# MiBeacon 帧中 frame counter 所在的偏移
+_FRAME_CNT_OFFSET = 4
+
+RESULT_NAMES: tuple[str, ...] = (
+    "decoded",
+    "ignored",
+    "no_bindkey",
+    "decrypt_failed",
+    "empty",
+)
+
+
+class FrameLog:
+    """Preallocated ring buffer of the last ``size`` frames of one device."""
+
+    def __init__(self, size: int) -> None:
+        """Initialize the ring buffer."""
+        self._size = size
+        self._index = 0
+        self._count = 0
+        self._raw: list[bytes | None] = [None] * size
+        self._update: list[LinptechUpdate | None] = [None] * size
+        self._time = array("d", bytes(8 * size))
+        self._duration_ns = array("q", bytes(8 * size))
+        self._frame_cnt = array("h", [-1]) * size
+        self._result = bytearray(size)
+
+        # 累计计数器
+        self.result_counts = array("Q", bytes(8 * len(RESULT_NAMES)))
+        self.total_duration_ns = 0
+        self.max_duration_ns = 0
+
+    def record(
+        self,
+        raw: bytes | None,
+        frame_time: float,
+        result: int,
+        update: LinptechUpdate | None,
+        duration_ns: int,
+    ) -> None:
+        """Record a frame; only stores references into preallocated slots."""
+        i = self._index
+        self._raw[i] = raw
+        self._update[i] = update
+        self._time[i] = frame_time
+        self._duration_ns[i] = duration_ns
+        if raw is not None and len(raw) > _FRAME_CNT_OFFSET:
+            self._frame_cnt[i] = raw[_FRAME_CNT_OFFSET]
+        else:
+            self._frame_cnt[i] = -1
+        self._result[i] = result
+
+        self._index = (i + 1) % self._size
+        self._count += 1
+        self.result_counts[result] += 1
+        self.total_duration_ns += duration_ns
+        self.max_duration_ns = max(self.max_duration_ns, duration_ns)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return counters and the buffered frames, oldest first."""
+        filled = min(self._count, self._size)
+        start = (self._index - filled) % self._size
+
+        frames: list[dict[str, Any]] = []
+        for n in range(filled):
+            i = (start + n) % self._size
+            raw = self._raw[i]
+            update = self._update[i]
+            frames.append(
+                {
+                    "monotonic_time": self._time[i],
+                    "frame_cnt": self._frame_cnt[i],
+                    "result": RESULT_NAMES[self._result[i]],
+                    "duration_us": self._duration_ns[i] / 1000,
+                    "raw": raw.hex() if raw is not None else None,
+                    "update": asdict(update) if update is not None else None,
+                }
+            )
+
+        return {
+            "frames_total": self._count,
+            "results": dict(zip(RESULT_NAMES, self.result_counts, strict=True)),
+            "mean_duration_us": (
+                self.total_duration_ns / self._count / 1000 if self._count else None
+            ),
+            "max_duration_us": self.max_duration_ns / 1000,
+            "buffer_size": self._size,
+            "frames": frames,
+        }
@@ -0,0 +1,141 @@
+"""
+Per-stage latency tracing for one Linptech BLE device.
+
+Every stage keeps its most recent samples in a preallocated ring, so
+recording costs an array store; percentiles are only computed when the
+diagnostic sensor or the diagnostics download asks for them. Stages:
+
+* ``dispatch`` - advert received by Home Assistant (``service_info.time``)
+  until the decoder starts. This covers the Bluetooth manager and, for
+  proxies, nothing before Home Assistant received the advert.
+* ``update`` - the whole ``LinptechBluetoothDeviceData.update`` call.
+* ``decrypt`` - AES-CCM decryption, including candidate bindkeys.
+* ``transform`` - conversion of an update into entity data (per platform).
+* ``write`` - one entity ``async_write_ha_state`` call.
+* ``end_to_end`` - advert received until the first entity state written
+  for that frame.
+
+``service_info.time`` comes from a coarse monotonic clock (a few ms
+resolution), which bounds the precision of ``dispatch`` and ``end_to_end``.
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+STAGE_DISPATCH = "dispatch"
+STAGE_UPDATE = "update"
+STAGE_DECRYPT = "decrypt"
+STAGE_TRANSFORM = "transform"
+STAGE_WRITE = "write"
+STAGE_END_TO_END = "end_to_end"
+
+STAGES: tuple[str, ...] = (
+    STAGE_DISPATCH,
+    STAGE_UPDATE,
+    STAGE_DECRYPT,
+    STAGE_TRANSFORM,
+    STAGE_WRITE,
+    STAGE_END_TO_END,
+)
+
+# 诊断传感器使用的百分位缓存有效期，单位秒
+_SUMMARY_TTL = 60.0
+
+
+class _Ring:
+    """Preallocated ring of float samples (seconds)."""
+
+    __slots__ = ("count", "index", "samples")
+
+    def __init__(self, size: int) -> None:
+        self.samples = array("d", bytes(8 * size))
+        self.index = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % len(self.samples)
+        self.count += 1
+
+    def summary(self) -> dict[str, Any]:
+        filled = sorted(self.samples[: min(self.count, len(self.samples))])
+        if not filled:
+            return {"count": 0}
+        last = len(filled) - 1
+        return {
+            "count": self.count,
+            "p50_ms": round(filled[last * 50 // 100] * 1000, 3),
+            "p90_ms": round(filled[last * 90 // 100] * 1000, 3),
+            "p99_ms": round(filled[last * 99 // 100] * 1000, 3),
+            "max_ms": round(filled[last] * 1000, 3),
+        }
+
+
+class LatencyTracker:
+    """Latency samples of the last frames of one device, per stage."""
+
+    def __init__(self, size: int) -> None:
+        """Initialize one ring of ``size`` samples per stage."""
+        self._rings = {stage: _Ring(size) for stage in STAGES}
+        # 最近一帧的接收时间；第一个实体写入状态时计算端到端延迟后清空
+        self._pending_frame: float | None = None
+        self._end_to_end_p95: float | None = None
+        self._summary_time = 0.0
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record one sample of ``stage``."""
+        self._rings[stage].add(seconds)
+
+    def begin_frame(self, frame_time: float, decoded: bool) -> None:  # noqa: FBT001
+        """Mark the frame received at monotonic ``frame_time`` as in flight."""
+        self._pending_frame = frame_time if decoded else None
+
+    def record_write(self, seconds: float) -> None:
+        """Record an entity state write; the first one completes the frame."""
+        self._rings[STAGE_WRITE].add(seconds)
+        if self._pending_frame is not None:
+            self._rings[STAGE_END_TO_END].add(time.monotonic() - self._pending_frame)
+            self._pending_frame = None
+
+    def timed(self, stage: str, func: Callable[_P, _R]) -> Callable[_P, _R]:
+        """Wrap ``func`` so that every call is recorded as ``stage``."""
+        ring = self._rings[stage]
+
+        def _timed(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                ring.add(time.perf_counter() - start)
+
+        return _timed
+
+    @property
+    def end_to_end_p95(self) -> float | None:
+        """Return the 95th percentile end-to-end latency in ms (cached)."""
+        now = time.monotonic()
+        if now - self._summary_time >= _SUMMARY_TTL:
+            ring = self._rings[STAGE_END_TO_END]
+            filled = sorted(ring.samples[: min(ring.count, len(ring.samples))])
+            self._end_to_end_p95 = (
+                round(filled[(len(filled) - 1) * 95 // 100] * 1000, 1)
+                if filled
+                else None
+            )
+            # 没有样本时不缓存，以便第一帧之后尽快给出数值
+            if filled:
+                self._summary_time = now
+        return self._end_to_end_p95
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return per-stage percentiles for the diagnostics download."""
+        return {stage: ring.summary() for stage, ring in self._rings.items()}
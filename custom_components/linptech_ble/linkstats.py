@@ -0,0 +1,101 @@
+"""
+Incremental link-quality statistics for one Linptech BLE device.
+
+All statistics are exponentially weighted moving averages updated in O(1)
+per received frame, without keeping any history:
+
+* Packet loss is derived from gaps in the 8-bit MiBeacon frame counter.
+  A repeated counter is a retransmission of the same frame and is not
+  counted; a gap of ``n`` means ``n - 1`` frames were missed. Gaps longer
+  than 255 frames (e.g. after a long outage) cannot be detected.
+* Inter-arrival mean and jitter are computed over received frames, the
+  jitter being the smoothed absolute difference between consecutive
+  inter-arrival times (as in RFC 3550).
+"""
+
+from __future__ import annotations
+
+# 到达间隔均值与抖动的平滑系数
+_INTERVAL_ALPHA = 1 / 16
+# 丢包率的平滑系数，以新帧为单位
+_LOSS_ALPHA = 1 / 32
+
+
+class LinkStats:
+    """Smoothed packet loss and inter-arrival statistics."""
+
+    __slots__ = (
+        "_expected",
+        "_last_cnt",
+        "_last_interval",
+        "_last_time",
+        "_received",
+        "frames",
+        "interval_jitter",
+        "interval_mean",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.frames = 0
+        self.interval_mean: float | None = None
+        self.interval_jitter: float | None = None
+        self._last_cnt = -1
+        self._last_time: float | None = None
+        self._last_interval: float | None = None
+        self._expected = 0.0
+        self._received = 0.0
+
+    def record(self, frame_cnt: int, frame_time: float) -> None:
+        """Record one received frame (monotonic ``frame_time`` in seconds)."""
+        self.frames += 1
+
+        if self._last_time is not None:
+            interval = frame_time - self._last_time
+            if self.interval_mean is None:
+                self.interval_mean = interval
+            else:
+                self.interval_mean += (interval - self.interval_mean) * _INTERVAL_ALPHA
+            if self._last_interval is not None:
+                deviation = abs(interval - self._last_interval)
+                if self.interval_jitter is None:
+                    self.interval_jitter = deviation
+                else:
+                    self.interval_jitter += (
+                        deviation - self.interval_jitter
+                    ) * _INTERVAL_ALPHA
+            self._last_interval = interval
+        self._last_time = frame_time
+
+        if self._last_cnt >= 0:
+            gap = (frame_cnt - self._last_cnt) & 0xFF
+            # gap == 0 表示同一帧的重复广播，不参与丢包统计
+            if gap:
+                decay = 1 - _LOSS_ALPHA
+                self._expected = self._expected * decay + gap
+                self._received = self._received * decay + 1
+        self._last_cnt = frame_cnt
+
+    @property
+    def last_frame_cnt(self) -> int | None:
+        """Return the frame counter of the last received frame."""
+        return self._last_cnt if self._last_cnt >= 0 else None
+
+    @property
+    def last_time(self) -> float | None:
+        """Return the monotonic arrival time of the last received frame."""
+        return self._last_time
+
+    @property
+    def packet_loss(self) -> float | None:
+        """Return the smoothed packet loss ratio (0..1)."""
+        if not self._expected:
+            return None
+        return 1 - self._received / self._expected
+
+    @property
+    def adverts_per_minute(self) -> float | None:
+        """Return the smoothed advertisement rate."""
+        if not self.interval_mean:
+            return None
+        return 60 / self.interval_mean
@@ -0,0 +1,419 @@
+r"""
+Synthetic fleet load generator for Linptech BLE.
+
+Simulates many PS1BB devices without hardware to find the scaling limit of
+the integration. Every virtual device gets its own address and bindkey and
+produces realistic, encrypted MiBeacon v5 frames (pressure state, durations
+and battery) using :func:`encrypt_mibeacon_v4_v5`. The frames are injected
+on the event loop through local stand-ins of the bluetooth manager and the
+``PassiveBluetoothProcessorCoordinator``, which run the real decoder and the
+real entity transforms.
+
+For each fleet size it reports event loop latency, CPU time per
+advertisement and memory per device. Run it in the development environment
+(the package import pulls in Home Assistant)::
+
+    PYTHONPATH=custom_components python -m linptech_ble.loadgen \
+        --devices 100,1000,5000 --interval 2 --duration 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from statistics import quantiles
+from typing import TYPE_CHECKING, Any
+
+from .binary_sensor import binary_sensor_update_to_bluetooth_data_update
+from .const import (
+    FRAME_LOG_SIZE,
+    OBJECT_ID_BATTERY,
+    OBJECT_ID_PRESSURE_NOT_PRESENT_DURATION,
+    OBJECT_ID_PRESSURE_PRESENT_DURATION,
+    OBJECT_ID_PRESSURE_STATE,
+    PRODUCT_ID_PS1BB,
+)
+from .device import (
+    FRAMECTRL_ENCRYPTED,
+    FRAMECTRL_MAC_PRESENT,
+    FRAMECTRL_OBJECT_PRESENT,
+    MI_SERVICE_UUID,
+    create_device_data,
+)
+from .latency import STAGE_TRANSFORM
+from .mibeacon import encrypt_mibeacon_v4_v5
+from .sensor import sensor_update_to_bluetooth_data_update
+from .store import FleetStateStore
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .device import LinptechBluetoothDeviceData
+
+# MiBeacon v5 + 加密 + 携带 MAC + 携带对象
+FRAME_CTRL = (
+    0x5000 | FRAMECTRL_ENCRYPTED | FRAMECTRL_MAC_PRESENT | FRAMECTRL_OBJECT_PRESENT
+)
+
+# 事件循环延迟探针的采样周期，单位秒
+LAG_PROBE_INTERVAL = 0.05
+# 注入任务的调度周期，单位秒
+INJECT_TICK = 0.01
+
+
+@dataclass(slots=True)
+class FakeServiceInfo:
+    """Minimal stand-in for ``BluetoothServiceInfoBleak``."""
+
+    address: str
+    rssi: int
+    service_data: dict[str, bytes]
+    time: float
+
+
+class VirtualDevice:
+    """A simulated PS1BB with its own address, bindkey and seat state."""
+
+    def __init__(self, index: int, rng: random.Random) -> None:
+        """Initialize the virtual device."""
+        self.address = ":".join(
+            f"{b:02X}" for b in (0xA4, 0xC1, 0x38, *index.to_bytes(3, "big"))
+        )
+        self.bindkey = rng.randbytes(16)
+        self.rssi = rng.randint(-95, -45)
+        self._rng = rng
+        self._frame_cnt = rng.randrange(256)
+        self._ext_cnt = 0
+        self._occupied = rng.random() < 0.5  # noqa: PLR2004
+        self._duration = rng.randrange(3600)
+        self._battery = rng.randint(20, 100)
+
+    def frames(self, count: int) -> list[bytes]:
+        """Pre-generate ``count`` consecutive encrypted frames."""
+        return [self._next_frame() for _ in range(count)]
+
+    def _next_frame(self) -> bytes:
+        """Advance the simulated seat and build one MiBeacon frame."""
+        rng = self._rng
+        self._frame_cnt = (self._frame_cnt + 1) & 0xFF
+        if self._frame_cnt == 0:
+            self._ext_cnt = (self._ext_cnt + 1) & 0xFFFFFF
+
+        # 大约每 10 帧切换一次占用状态
+        if rng.random() < 0.1:  # noqa: PLR2004
+            self._occupied = not self._occupied
+            self._duration = 0
+        self._duration += rng.randint(1, 30)
+
+        objects = _tlv(OBJECT_ID_PRESSURE_STATE, bytes([int(self._occupied)]))
+        if self._frame_cnt % 8 == 0:
+            self._battery = max(0, self._battery - rng.randint(0, 1))
+            objects += _tlv(OBJECT_ID_BATTERY, bytes([self._battery]))
+        else:
+            obj_id = (
+                OBJECT_ID_PRESSURE_PRESENT_DURATION
+                if self._occupied
+                else OBJECT_ID_PRESSURE_NOT_PRESENT_DURATION
+            )
+            objects += _tlv(obj_id, self._duration.to_bytes(4, "little"))
+
+        mac = bytes.fromhex(self.address.replace(":", ""))
+        segment = encrypt_mibeacon_v4_v5(
+            objects,
+            bindkey=self.bindkey,
+            address=self.address,
+            product_id=PRODUCT_ID_PS1BB,
+            frame_counter=self._frame_cnt,
+            trailer=self._ext_cnt.to_bytes(3, "little"),
+        )
+        return (
+            FRAME_CTRL.to_bytes(2, "little")
+            + PRODUCT_ID_PS1BB.to_bytes(2, "little")
+            + bytes([self._frame_cnt])
+            + mac[::-1]
+            + segment
+        )
+
+
+def _tlv(obj_id: int, data: bytes) -> bytes:
+    """Encode one MiBeacon object."""
+    return obj_id.to_bytes(2, "little") + bytes([len(data)]) + data
+
+
+class StandInCoordinator:
+    """
+    Local stand-in for ``PassiveBluetoothProcessorCoordinator``.
+
+    Runs the device's update method and then every processor transform,
+    timed like the platforms time them, merging the results like
+    ``PassiveBluetoothDataProcessor`` does.
+    """
+
+    def __init__(self, device_data: LinptechBluetoothDeviceData) -> None:
+        """Initialize the coordinator stand-in."""
+        self._update_method = device_data.update
+        self._transforms: tuple[Callable[[Any], Any], ...] = (
+            sensor_update_to_bluetooth_data_update,
+            binary_sensor_update_to_bluetooth_data_update,
+        )
+        if (latency := device_data.latency) is not None:
+            self._transforms = tuple(
+                latency.timed(STAGE_TRANSFORM, transform)
+                for transform in self._transforms
+            )
+        self.entity_data: list[dict[Any, Any]] = [{} for _ in self._transforms]
+
+    def handle(self, service_info: FakeServiceInfo) -> None:
+        """Handle one advertisement."""
+        update = self._update_method(service_info)
+        for transform, entity_data in zip(
+            self._transforms, self.entity_data, strict=True
+        ):
+            entity_data.update(transform(update).entity_data)
+
+
+class StandInManager:
+    """Local stand-in for the bluetooth manager's per-address dispatch."""
+
+    def __init__(self) -> None:
+        """Initialize the manager stand-in."""
+        self._callbacks: dict[str, Callable[[FakeServiceInfo], None]] = {}
+        self.busy_ns = 0
+        self.adverts = 0
+
+    def register(
+        self, address: str, callback: Callable[[FakeServiceInfo], None]
+    ) -> None:
+        """Register the advertisement callback of one address."""
+        self._callbacks[address] = callback
+
+    def inject(self, service_info: FakeServiceInfo) -> None:
+        """Dispatch an advertisement synchronously, as the real manager does."""
+        start = time.perf_counter_ns()
+        self._callbacks[service_info.address](service_info)
+        self.busy_ns += time.perf_counter_ns() - start
+        self.adverts += 1
+
+
+@dataclass
+class StepResult:
+    """Measurements for one fleet size."""
+
+    devices: int
+    target_rate: float
+    achieved_rate: float
+    cpu_us_per_advert: float
+    loop_busy: float
+    lag_p50_ms: float
+    lag_p99_ms: float
+    lag_max_ms: float
+    memory_kib_per_device: float
+    occupancy_events: int
+
+
+async def run_step(  # noqa: PLR0913
+    devices: int,
+    *,
+    interval: float,
+    duration: float,
+    pool: int,
+    seed: int,
+    measure_memory: bool,
+) -> StepResult:
+    """Simulate ``devices`` devices advertising every ``interval`` seconds."""
+    rng = random.Random(seed)  # noqa: S311
+    fleet = [VirtualDevice(i, rng) for i in range(devices)]
+    # 帧提前生成，避免加密开销计入被测的事件循环
+    frames = [device.frames(pool) for device in fleet]
+
+    events = 0
+
+    def _on_occupancy(*_args: object) -> None:
+        nonlocal events
+        events += 1
+
+    gc.collect()
+    if measure_memory:
+        tracemalloc.start()
+
+    manager = StandInManager()
+    # 与 async_setup_entry 相同的方式创建解码器，包括延迟统计与共享状态存储
+    store = FleetStateStore()
+    for device in fleet:
+        device_data, _detach = create_device_data(
+            device.address,
+            device.bindkey,
+            store,
+            occupancy_callback=_on_occupancy,
+        )
+        manager.register(device.address, StandInCoordinator(device_data).handle)
+
+    # 预热：让每个设备的 FrameLog 与实体数据都达到稳定状态。
+    # 复制帧数据，使 FrameLog 引用的原始帧也计入内存统计(真实环境中每帧都是新对象)
+    now = time.monotonic()
+    for n in range(FRAME_LOG_SIZE if measure_memory else 1):
+        for device, device_frames in zip(fleet, frames, strict=True):
+            manager.inject(
+                FakeServiceInfo(
+                    device.address,
+                    device.rssi,
+                    {MI_SERVICE_UUID: bytes(memoryview(device_frames[n % pool]))},
+                    now,
+                )
+            )
+
+    memory = 0.0
+    if measure_memory:
+        memory = tracemalloc.get_traced_memory()[0] / devices / 1024
+        tracemalloc.stop()
+
+    manager.busy_ns = 0
+    manager.adverts = 0
+    events = 0
+
+    wall, lags = await _measure(manager, fleet, frames, interval, duration)
+
+    adverts = manager.adverts or 1
+    lag_q = quantiles(lags, n=100, method="inclusive") if len(lags) > 1 else [0.0] * 99
+    return StepResult(
+        devices=devices,
+        target_rate=devices / interval,
+        achieved_rate=manager.adverts / wall,
+        cpu_us_per_advert=manager.busy_ns / adverts / 1000,
+        loop_busy=manager.busy_ns / 1e9 / wall,
+        lag_p50_ms=lag_q[49] * 1000,
+        lag_p99_ms=lag_q[98] * 1000,
+        lag_max_ms=max(lags, default=0.0) * 1000,
+        memory_kib_per_device=memory,
+        occupancy_events=events,
+    )
+
+
+async def _measure(
+    manager: StandInManager,
+    fleet: list[VirtualDevice],
+    frames: list[list[bytes]],
+    interval: float,
+    duration: float,
+) -> tuple[float, list[float]]:
+    """Inject the fleet's adverts for ``duration`` seconds while probing lag."""
+    devices = len(fleet)
+    pool = len(frames[0])
+    loop = asyncio.get_running_loop()
+    stop = loop.time() + duration
+    lags: list[float] = []
+
+    async def _probe() -> None:
+        while loop.time() < stop:
+            start = loop.time()
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            lags.append(loop.time() - start - LAG_PROBE_INTERVAL)
+
+    async def _produce() -> None:
+        rate = devices / interval
+        owed = 0.0
+        cursor = 0
+        last = loop.time()
+        while last < stop:
+            await asyncio.sleep(INJECT_TICK)
+            now = loop.time()
+            owed += (now - last) * rate
+            last = now
+            # 同一周期内到期的广播一次性同步注入，模拟代理批量转发
+            while owed >= 1:
+                owed -= 1
+                index = cursor % devices
+                device = fleet[index]
+                manager.inject(
+                    FakeServiceInfo(
+                        device.address,
+                        device.rssi,
+                        {MI_SERVICE_UUID: frames[index][(cursor // devices) % pool]},
+                        now,
+                    )
+                )
+                cursor += 1
+
+    wall_start = loop.time()
+    await asyncio.gather(_probe(), _produce())
+    return loop.time() - wall_start, lags
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m linptech_ble.loadgen",
+        description="Simulate a fleet of Linptech PS1BB devices.",
+    )
+    parser.add_argument(
+        "--devices",
+        default="100,500,1000,2000,5000",
+        help="comma separated fleet sizes to simulate (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=2.0,
+        help="advertising interval per device in seconds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="measurement time per fleet size in seconds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--pool",
+        type=int,
+        default=16,
+        help="pre-generated frames per device (default: %(default)s)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="skip the (slower) traced warm-up used to measure memory",
+    )
+    return parser.parse_args(argv)
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Run all requested fleet sizes and print a table."""
+    out = sys.stdout
+    out.write(
+        f"{'devices':>8} {'target/s':>9} {'actual/s':>9} {'us/adv':>7} "
+        f"{'loop%':>6} {'lag p50':>8} {'lag p99':>8} {'lag max':>8} "
+        f"{'KiB/dev':>8} {'events':>7}\n"
+    )
+    for devices in (int(n) for n in args.devices.split(",") if n.strip()):
+        result = await run_step(
+            devices,
+            interval=args.interval,
+            duration=args.duration,
+            pool=args.pool,
+            seed=args.seed,
+            measure_memory=not args.no_memory,
+        )
+        out.write(
+            f"{result.devices:>8} {result.target_rate:>9.0f} "
+            f"{result.achieved_rate:>9.0f} {result.cpu_us_per_advert:>7.1f} "
+            f"{result.loop_busy:>6.1%} {result.lag_p50_ms:>6.1f}ms "
+            f"{result.lag_p99_ms:>6.1f}ms {result.lag_max_ms:>6.1f}ms "
+            f"{result.memory_kib_per_device:>8.2f} {result.occupancy_events:>7}\n"
+        )
+        out.flush()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry point of the load generator."""
+    asyncio.run(_async_main(_parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Hourly long-term statistics for Linptech BLE.
+
+Instead of letting the recorder compile long-term statistics from the
+high-churn duration and battery states, every device aggregates its own
+hourly values while decoding and imports them once per hour as external
+statistics:
+
+* ``linptech_ble:<mac>_occupied_time`` - occupied seconds (sum)
+* ``linptech_ble:<mac>_sessions`` - occupied sessions started (sum)
+* ``linptech_ble:<mac>_battery`` - battery level (mean, min, max)
+
+The hour that is in progress when Home Assistant stops is not imported;
+after a restart aggregation starts again with the next full hour.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, cast
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import CONF_ADDRESS, PERCENTAGE, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import DurationConverter
+
+from .const import DOMAIN
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:  # 较旧的 recorder 只支持 has_mean
+    StatisticMeanType = None  # type: ignore[assignment,misc]
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .device import LinptechBluetoothDeviceData, LinptechUpdate
+
+_HOUR = 3600
+
+
+@dataclass(slots=True)
+class HourlyBucket:
+    """Aggregated values of one device for one clock hour."""
+
+    start: int
+    occupied_seconds: float
+    sessions: int
+    battery_min: int | None = None
+    battery_max: int | None = None
+    battery_mean: float | None = None
+
+
+class HourlyAggregator:
+    """Accumulates one device's updates into hourly buckets in O(1) per frame."""
+
+    def __init__(self, now: float) -> None:
+        """Start aggregating at the next full hour after ``now``."""
+        # 启动时所在的小时数据不完整，从下一个整点开始统计
+        self._hour = (int(now) // _HOUR + 1) * _HOUR
+        self._occupied: bool | None = None
+        self._since = float(self._hour)
+        self._occupied_seconds = 0.0
+        self._sessions = 0
+        self._battery_min: int | None = None
+        self._battery_max: int | None = None
+        self._battery_total = 0
+        self._battery_count = 0
+
+    def observe(self, update: LinptechUpdate, now: float) -> list[HourlyBucket]:
+        """Account one update; returns the hours completed before ``now``."""
+        completed = self.roll(now)
+        if now < self._hour:
+            # 仍处于启动时不完整的小时内，只跟踪占用状态
+            if update.pressure_state is not None:
+                self._occupied = update.pressure_state
+            return completed
+
+        occupied = update.pressure_state
+        if occupied is not None and occupied != self._occupied:
+            if self._occupied:
+                self._occupied_seconds += now - self._since
+            elif occupied:
+                self._sessions += 1
+            self._occupied = occupied
+            self._since = now
+
+        battery = update.battery
+        if battery is not None:
+            if self._battery_min is None or battery < self._battery_min:
+                self._battery_min = battery
+            if self._battery_max is None or battery > self._battery_max:
+                self._battery_max = battery
+            self._battery_total += battery
+            self._battery_count += 1
+        return completed
+
+    def roll(self, now: float) -> list[HourlyBucket]:
+        """Close every hour that ended at or before ``now``."""
+        completed: list[HourlyBucket] = []
+        while now >= self._hour + _HOUR:
+            end = self._hour + _HOUR
+            if self._occupied:
+                self._occupied_seconds += end - max(self._since, self._hour)
+            completed.append(
+                HourlyBucket(
+                    start=self._hour,
+                    occupied_seconds=self._occupied_seconds,
+                    sessions=self._sessions,
+                    battery_min=self._battery_min,
+                    battery_max=self._battery_max,
+                    battery_mean=self._battery_total / self._battery_count
+                    if self._battery_count
+                    else None,
+                )
+            )
+            self._hour = end
+            self._since = float(end)
+            self._occupied_seconds = 0.0
+            self._sessions = 0
+            self._battery_min = self._battery_max = None
+            self._battery_total = self._battery_count = 0
+        return completed
+
+
+async def async_setup_long_term_statistics(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    device_data: LinptechBluetoothDeviceData,
+) -> None:
+    """Aggregate the device's updates hourly and import them as statistics."""
+    address: str = entry.data[CONF_ADDRESS]
+    object_id = address.replace(":", "").lower()
+    name = entry.title
+    occupied_meta = _metadata(
+        f"{object_id}_occupied_time",
+        f"{name} occupied time",
+        UnitOfTime.SECONDS,
+        unit_class=DurationConverter.UNIT_CLASS,
+    )
+    sessions_meta = _metadata(f"{object_id}_sessions", f"{name} sessions", None)
+    battery_meta = _metadata(
+        f"{object_id}_battery", f"{name} battery", PERCENTAGE, has_mean=True
+    )
+
+    # 累计值(sum)需要从数据库中已导入的最后一条统计继续
+    last_start = 0.0
+    sums: dict[str, float] = {}
+    for meta in (occupied_meta, sessions_meta):
+        statistic_id = meta["statistic_id"]
+        last = await get_instance(hass).async_add_executor_job(
+            get_last_statistics,
+            hass,
+            1,
+            statistic_id,
+            True,  # noqa: FBT003
+            {"sum"},
+        )
+        if rows := last.get(statistic_id):
+            sums[statistic_id] = rows[0].get("sum") or 0.0
+            last_start = max(last_start, rows[0]["start"])
+
+    aggregator = HourlyAggregator(max(time.time(), last_start))
+
+    @callback
+    def _async_import(buckets: list[HourlyBucket]) -> None:
+        if not buckets:
+            return
+        occupied: list[StatisticData] = []
+        sessions: list[StatisticData] = []
+        battery: list[StatisticData] = []
+        occupied_sum = sums.get(occupied_meta["statistic_id"], 0.0)
+        sessions_sum = sums.get(sessions_meta["statistic_id"], 0.0)
+        for bucket in buckets:
+            start = dt_util.utc_from_timestamp(bucket.start)
+            occupied_sum += bucket.occupied_seconds
+            sessions_sum += bucket.sessions
+            occupied.append(
+                StatisticData(
+                    start=start, state=bucket.occupied_seconds, sum=occupied_sum
+                )
+            )
+            sessions.append(
+                StatisticData(start=start, state=bucket.sessions, sum=sessions_sum)
+            )
+            if bucket.battery_mean is not None:
+                battery.append(
+                    StatisticData(
+                        start=start,
+                        mean=bucket.battery_mean,
+                        min=bucket.battery_min,
+                        max=bucket.battery_max,
+                    )
+                )
+        sums[occupied_meta["statistic_id"]] = occupied_sum
+        sums[sessions_meta["statistic_id"]] = sessions_sum
+
+        async_add_external_statistics(hass, occupied_meta, occupied)
+        async_add_external_statistics(hass, sessions_meta, sessions)
+        if battery:
+            async_add_external_statistics(hass, battery_meta, battery)
+
+    @callback
+    def _async_roll(now: datetime) -> None:
+        _async_import(aggregator.roll(now.timestamp()))
+
+    entry.async_on_unload(
+        device_data.add_update_listener(
+            lambda update: _async_import(aggregator.observe(update, time.time()))
+        )
+    )
+    # 整点后即使没有收到广播也要导入已结束的小时，例如整小时持续占用的情况
+    entry.async_on_unload(
+        async_track_utc_time_change(hass, _async_roll, minute=0, second=10)
+    )
+
+
+def _metadata(
+    object_id: str,
+    name: str,
+    unit: str | None,
+    *,
+    has_mean: bool = False,
+    unit_class: str | None = None,
+) -> StatisticMetaData:
+    """
+    Return the metadata of one external statistic.
+
+    Newer recorder versions describe the mean with ``mean_type`` (replacing
+    the deprecated ``has_mean``) and expect a ``unit_class``; older ones
+    only know ``has_mean``. The fields are set for whichever version runs.
+    """
+    metadata: dict[str, Any] = {
+        "has_sum": not has_mean,
+        "name": name,
+        "source": DOMAIN,
+        "statistic_id": f"{DOMAIN}:{object_id}",
+        "unit_of_measurement": unit,
+    }
+    if StatisticMeanType is not None:
+        metadata["mean_type"] = (
+            StatisticMeanType.ARITHMETIC if has_mean else StatisticMeanType.NONE
+        )
+    else:
+        metadata["has_mean"] = has_mean
+    if "unit_class" in StatisticMetaData.__annotations__:
+        metadata["unit_class"] = unit_class
+    return cast("StatisticMetaData", metadata)
@@ -23,6 +23,7 @@ def decrypt_mibeacon_v4_v5(
     product_id: int,
     frame_counter: int,
     frame_ctrl: int,
+    log_failure: bool = True,
 ) -> bytes | None:
     """
     Decrypt a MiBeacon v4/v5 payload using AES-CCM.
@@ -38,7 +39,8 @@ def decrypt_mibeacon_v4_v5(
     * The last 4 bytes of the payload are the MIC (authentication tag).
 
     The function returns the decrypted object payload on success,
-    or ``None`` if decryption fails.
+    or ``None`` if decryption fails. Pass ``log_failure=False`` when a
+    failed tag check is an expected outcome (e.g. probing a bindkey).
     """
     # We expect ``data`` to contain:
     #   <encrypted object payload> + <3-byte trailer> + <4-byte MIC>
@@ -88,6 +90,8 @@ def decrypt_mibeacon_v4_v5(
         # AESCCM expects ciphertext + tag concatenated
         return aesccm.decrypt(nonce, ciphertext + mic, aad)
     except Exception as err:
+        if not log_failure:
+            return None
         LOGGER.warning("AES-CCM decryption failed for MiBeacon payload: %s", err)
         LOGGER.debug("  Nonce: %s", nonce.hex().upper())
         LOGGER.debug("  AAD: %s", aad.hex().upper())
@@ -95,3 +99,40 @@ def decrypt_mibeacon_v4_v5(
         LOGGER.debug("  MIC: %s", mic.hex().upper())
         LOGGER.debug("  Trailer (for nonce): %s", trailer.hex().upper())
         return None
+
+
+def encrypt_mibeacon_v4_v5(  # noqa: PLR0913
+    data: bytes,
+    *,
+    bindkey: bytes,
+    address: str,
+    product_id: int,
+    frame_counter: int,
+    trailer: bytes = b"\x00\x00\x00",
+) -> bytes:
+    """
+    Encrypt a MiBeacon v4/v5 object payload using AES-CCM.
+
+    This is the counterpart of :func:`decrypt_mibeacon_v4_v5` and is used
+    to synthesise advertisements (e.g. for load testing). It returns
+    ``<ciphertext> + <3-byte trailer> + <4-byte MIC>``, i.e. exactly the
+    object segment that ``decrypt_mibeacon_v4_v5`` expects. The trailer
+    is the extended frame counter that goes into the nonce.
+
+    Raises ``ValueError`` for a malformed address, bindkey or trailer.
+    """
+    if len(trailer) != 3:  # noqa: PLR2004
+        msg = f"MiBeacon trailer must be 3 bytes, got {len(trailer)}"
+        raise ValueError(msg)
+
+    mac_bytes = bytes.fromhex(address.replace(":", ""))
+    nonce = (
+        mac_bytes[::-1]
+        + product_id.to_bytes(2, "little")
+        + bytes([frame_counter & 0xFF])
+        + trailer
+    )
+
+    sealed = AESCCM(bindkey, tag_length=4).encrypt(nonce, data, b"\x11")
+    # AESCCM 输出为 ciphertext + tag，MiBeacon 在两者之间插入 trailer
+    return sealed[:-4] + trailer + sealed[-4:]
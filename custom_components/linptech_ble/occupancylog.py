@@ -0,0 +1,222 @@
+"""
+Append-only binary occupancy log for Linptech BLE.
+
+Each device gets one file holding a 16-byte header followed by fixed-width
+12-byte records, one per occupancy transition::
+
+    header: magic "LPOC" | version u16 | record size u16 | MAC (6 bytes) | pad
+    record: timestamp (ms since epoch, i64) | occupied (u8) | pad (3 bytes)
+
+Timestamps are kept non-decreasing by the writer so that
+:class:`OccupancyLogReader` can binary-search a memory-mapped file and
+compute long-range occupancy in milliseconds. This module has no Home
+Assistant dependency so logs can also be analysed offline.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import time
+from typing import TYPE_CHECKING, Self
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from .device import LinptechUpdate
+
+MAGIC = b"LPOC"
+VERSION = 1
+HEADER = struct.Struct("<4sHH6s2x")
+RECORD = struct.Struct("<qB3x")
+
+
+class OccupancyLogError(Exception):
+    """Raised when an occupancy log file is malformed."""
+
+
+class OccupancyLogWriter:
+    """
+    Buffered writer for one device's occupancy log.
+
+    :meth:`observe` only appends to an in-memory buffer and is safe to call
+    from the event loop; :meth:`write` performs the blocking file I/O and
+    fsync and is meant to run periodically in an executor.
+    """
+
+    def __init__(self, path: Path, address: str) -> None:
+        """Initialize the writer; call :meth:`open` before writing."""
+        self.path = path
+        self._mac = bytes.fromhex(address.replace(":", ""))
+        self._address = ":".join(f"{b:02X}" for b in self._mac)
+        self._pending = bytearray()
+        self._last_state: bool | None = None
+        self._last_ts = 0
+
+    def open(self) -> None:
+        """
+        Create the file (with header) or resume after its last record.
+
+        A file that is not a readable log of this device is renamed to
+        ``<name>.corrupt-<timestamp ms>`` and a new log is started.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists() or self.path.stat().st_size < HEADER.size:
+            self._create()
+            return
+
+        try:
+            reader = OccupancyLogReader(self.path)
+        except OccupancyLogError as err:
+            self._move_aside(str(err))
+            return
+
+        with reader:
+            owner = reader.address
+            if owner == self._address and len(reader):
+                self._last_ts, self._last_state = reader[len(reader) - 1]
+            # 截断崩溃时写了一半的记录，保证后续追加仍然按记录对齐
+            valid_size = HEADER.size + len(reader) * RECORD.size
+        if owner != self._address:
+            self._move_aside(f"{self.path} belongs to {owner}")
+        elif self.path.stat().st_size != valid_size:
+            os.truncate(self.path, valid_size)
+
+    def _create(self) -> None:
+        """Write a new file holding only the header."""
+        with self.path.open("wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, self._mac))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _move_aside(self, reason: str) -> None:
+        """Keep an unusable file for inspection and start a new log."""
+        stamp = time.time_ns() // 1_000_000
+        while (
+            target := self.path.with_name(f"{self.path.name}.corrupt-{stamp}")
+        ).exists():
+            stamp += 1
+        LOGGER.warning("%s; moving it to %s and starting a new log", reason, target)
+        self.path.replace(target)
+        self._create()
+
+    def observe(self, update: LinptechUpdate, timestamp_ms: int) -> None:
+        """Buffer a record if ``update`` carries a new occupancy state."""
+        occupied = update.pressure_state
+        if occupied is None or occupied == self._last_state:
+            return
+        self._last_state = occupied
+        self._last_ts = max(timestamp_ms, self._last_ts)
+        self._pending += RECORD.pack(self._last_ts, occupied)
+
+    def take_pending(self) -> bytes:
+        """Return and clear the buffered records (call from the event loop)."""
+        data = bytes(self._pending)
+        self._pending.clear()
+        return data
+
+    def write(self, data: bytes) -> None:
+        """Append ``data`` taken from :meth:`take_pending` and fsync."""
+        if not data:
+            return
+        with self.path.open("ab") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+
+class OccupancyLogReader:
+    """Memory-mapped, read-only view of an occupancy log."""
+
+    def __init__(self, path: Path) -> None:
+        """Open and map ``path``."""
+        with path.open("rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                msg = f"{path} is too short to be an occupancy log"
+                raise OccupancyLogError(msg)
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, mac = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._map.close()
+            msg = f"{path} is not a version {VERSION} occupancy log"
+            raise OccupancyLogError(msg)
+
+        self.address = ":".join(f"{b:02X}" for b in mac)
+        self._count = (size - HEADER.size) // RECORD.size
+
+    def __enter__(self) -> Self:
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Unmap the file."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+    def __len__(self) -> int:
+        """Return the number of complete records."""
+        return self._count
+
+    def __getitem__(self, index: int) -> tuple[int, bool]:
+        """Return ``(timestamp_ms, occupied)`` of record ``index``."""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        timestamp, occupied = RECORD.unpack_from(
+            self._map, HEADER.size + index * RECORD.size
+        )
+        return timestamp, bool(occupied)
+
+    def bisect(self, timestamp_ms: int) -> int:
+        """Return the index of the first record at or after ``timestamp_ms``."""
+        lo, hi = 0, self._count
+        unpack_from = RECORD.unpack_from
+        buf = self._map
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if unpack_from(buf, HEADER.size + mid * RECORD.size)[0] < timestamp_ms:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def range(self, start_ms: int, end_ms: int) -> Iterator[tuple[int, bool]]:
+        """Iterate over the records with ``start_ms <= timestamp < end_ms``."""
+        first = self.bisect(start_ms)
+        last = self.bisect(end_ms)
+        view = memoryview(self._map)[
+            HEADER.size + first * RECORD.size : HEADER.size + last * RECORD.size
+        ]
+        try:
+            for timestamp, occupied in RECORD.iter_unpack(view):
+                yield timestamp, bool(occupied)
+        finally:
+            view.release()
+
+    def occupied_ms(self, start_ms: int, end_ms: int) -> int:
+        """Return the total occupied time within ``[start_ms, end_ms)``."""
+        first = self.bisect(start_ms)
+        # 区间开始时的状态取决于区间之前的最后一条记录
+        occupied = self[first - 1][1] if first else False
+        since = start_ms
+        total = 0
+        for timestamp, state in self.range(start_ms, end_ms):
+            if occupied:
+                total += timestamp - since
+            occupied = state
+            since = timestamp
+        if occupied:
+            total += end_ms - since
+        return total
+
+    def sessions(self, start_ms: int, end_ms: int) -> int:
+        """Return the number of occupied sessions starting in the range."""
+        return sum(1 for _, occupied in self.range(start_ms, end_ms) if occupied)
@@ -26,7 +26,12 @@ from homeassistant.helpers.device_registry import DeviceInfo
 
 from .const import (
     DOMAIN,
+    KEY_ADVERTS_PER_MINUTE,
     KEY_BATTERY,
+    KEY_INTERVAL_JITTER,
+    KEY_INTERVAL_MEAN,
+    KEY_LATENCY,
+    KEY_PACKET_LOSS,
     KEY_PRESSURE_NOT_PRESENT_DURATION,
     KEY_PRESSURE_NOT_PRESENT_TIME_SET,
     KEY_PRESSURE_PRESENT_DURATION,
@@ -34,6 +39,8 @@ from .const import (
     KEY_RSSI,
     MODEL_PS1BB,
 )
+from .entity import LinptechLatencyEntity
+from .latency import STAGE_TRANSFORM
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -43,7 +50,7 @@ if TYPE_CHECKING:
     from .device import LinptechUpdate
 
 
-def sensor_update_to_bluetooth_data_update(
+def sensor_update_to_bluetooth_data_update(  # noqa: PLR0915
     update: LinptechUpdate | None,
 ) -> PassiveBluetoothDataUpdate:
     """
@@ -177,6 +184,86 @@ def sensor_update_to_bluetooth_data_update(
         entity_data[entity_key] = update.rssi
         entity_names.setdefault(entity_key, "BLE RSSI")
 
+    # 链路质量诊断传感器(丢包率、到达间隔均值/抖动、每分钟广播数)
+    if update.packet_loss is not None:
+        entity_key = PassiveBluetoothEntityKey(KEY_PACKET_LOSS, device_id)
+        entity_descriptions.setdefault(
+            entity_key,
+            SensorEntityDescription(
+                key=KEY_PACKET_LOSS,
+                native_unit_of_measurement=PERCENTAGE,
+                state_class=SensorStateClass.MEASUREMENT,
+                entity_category=EntityCategory.DIAGNOSTIC,
+                entity_registry_enabled_default=False,
+            ),
+        )
+        entity_data[entity_key] = round(update.packet_loss * 100, 1)
+        entity_names.setdefault(entity_key, "BLE Packet Loss")
+
+    if update.interval_mean is not None:
+        entity_key = PassiveBluetoothEntityKey(KEY_INTERVAL_MEAN, device_id)
+        entity_descriptions.setdefault(
+            entity_key,
+            SensorEntityDescription(
+                key=KEY_INTERVAL_MEAN,
+                device_class=SensorDeviceClass.DURATION,
+                native_unit_of_measurement=UnitOfTime.SECONDS,
+                state_class=SensorStateClass.MEASUREMENT,
+                entity_category=EntityCategory.DIAGNOSTIC,
+                entity_registry_enabled_default=False,
+            ),
+        )
+        entity_data[entity_key] = round(update.interval_mean, 2)
+        entity_names.setdefault(entity_key, "BLE Update Interval")
+
+    if update.interval_jitter is not None:
+        entity_key = PassiveBluetoothEntityKey(KEY_INTERVAL_JITTER, device_id)
+        entity_descriptions.setdefault(
+            entity_key,
+            SensorEntityDescription(
+                key=KEY_INTERVAL_JITTER,
+                device_class=SensorDeviceClass.DURATION,
+                native_unit_of_measurement=UnitOfTime.SECONDS,
+                state_class=SensorStateClass.MEASUREMENT,
+                entity_category=EntityCategory.DIAGNOSTIC,
+                entity_registry_enabled_default=False,
+            ),
+        )
+        entity_data[entity_key] = round(update.interval_jitter, 2)
+        entity_names.setdefault(entity_key, "BLE Update Jitter")
+
+    if update.adverts_per_minute is not None:
+        entity_key = PassiveBluetoothEntityKey(KEY_ADVERTS_PER_MINUTE, device_id)
+        entity_descriptions.setdefault(
+            entity_key,
+            SensorEntityDescription(
+                key=KEY_ADVERTS_PER_MINUTE,
+                native_unit_of_measurement="adverts/min",
+                state_class=SensorStateClass.MEASUREMENT,
+                entity_category=EntityCategory.DIAGNOSTIC,
+                entity_registry_enabled_default=False,
+            ),
+        )
+        entity_data[entity_key] = round(update.adverts_per_minute, 1)
+        entity_names.setdefault(entity_key, "BLE Adverts Per Minute")
+
+    # 端到端延迟诊断传感器(接收广播到实体状态写入，95 百分位)
+    if update.latency_p95 is not None:
+        entity_key = PassiveBluetoothEntityKey(KEY_LATENCY, device_id)
+        entity_descriptions.setdefault(
+            entity_key,
+            SensorEntityDescription(
+                key=KEY_LATENCY,
+                device_class=SensorDeviceClass.DURATION,
+                native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+                state_class=SensorStateClass.MEASUREMENT,
+                entity_category=EntityCategory.DIAGNOSTIC,
+                entity_registry_enabled_default=False,
+            ),
+        )
+        entity_data[entity_key] = update.latency_p95
+        entity_names.setdefault(entity_key, "BLE Latency")
+
     return PassiveBluetoothDataUpdate(
         devices=devices,
         entity_descriptions=entity_descriptions,
@@ -191,9 +278,13 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Linptech BLE sensors."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data.coordinator
 
-    processor = PassiveBluetoothDataProcessor(sensor_update_to_bluetooth_data_update)
+    transform = sensor_update_to_bluetooth_data_update
+    if (latency := data.device_data.latency) is not None:
+        transform = latency.timed(STAGE_TRANSFORM, transform)
+    processor = PassiveBluetoothDataProcessor(transform)
 
     entry.async_on_unload(
         processor.async_add_entities_listener(
@@ -206,7 +297,9 @@ async def async_setup_entry(
     )
 
 
-class LinptechBluetoothSensorEntity(PassiveBluetoothProcessorEntity, SensorEntity):
+class LinptechBluetoothSensorEntity(
+    LinptechLatencyEntity, PassiveBluetoothProcessorEntity, SensorEntity
+):
     """Linptech BLE sensor entity."""
 
     @property
@@ -0,0 +1,169 @@
+"""Services for Linptech BLE."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import pstats
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.components import persistent_notification
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DATA_FLEET_STORE, DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+    from .store import FleetStateStore
+
+SERVICE_PROFILE = "profile"
+SERVICE_QUERY_FLEET = "query_fleet"
+
+ATTR_DURATION = "duration"
+ATTR_TOP = "top"
+ATTR_OCCUPIED = "occupied"
+ATTR_BATTERY_BELOW = "battery_below"
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=60): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+        vol.Optional(ATTR_TOP, default=15): vol.All(
+            cv.positive_int, vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+QUERY_FLEET_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_OCCUPIED): cv.boolean,
+        vol.Optional(ATTR_BATTERY_BELOW): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=101)
+        ),
+    }
+)
+
+_PACKAGE_DIR = str(Path(__file__).parent)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+    # 同一时间只允许一个 profile 任务，cProfile 也不支持嵌套启用
+    lock = asyncio.Lock()
+
+    async def _async_profile(call: ServiceCall) -> None:
+        """
+        Profile the advertisement pipeline for a given duration.
+
+        A deterministic profiler is enabled only while the service runs and
+        covers the decoder, AES-CCM decryption and entity transforms on the
+        event loop. On Python 3.12+ it also records other threads, so the
+        integration's executor jobs (bindkey verification, occupancy log
+        writes) appear in the stats as well. Nothing is hooked when no
+        profile is running.
+        """
+        if lock.locked():
+            msg = "A Linptech BLE profile is already running"
+            raise HomeAssistantError(msg)
+
+        duration: float = call.data[ATTR_DURATION]
+        top: int = call.data[ATTR_TOP]
+
+        async with lock:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as err:
+                # Python 3.12+ 同时只能有一个 profiler(例如 HA profiler 集成)
+                msg = f"Cannot start profiler: {err}"
+                raise HomeAssistantError(msg) from err
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                profiler.disable()
+
+            path = hass.config.path(f"{DOMAIN}_profile_{int(time.time())}.prof")
+            summary = await hass.async_add_executor_job(
+                _write_profile, profiler, path, duration, top
+            )
+
+        LOGGER.info("Linptech BLE profile written to %s", path)
+        persistent_notification.async_create(
+            hass,
+            summary,
+            title="Linptech BLE profile",
+            notification_id=f"{DOMAIN}_profile",
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, _async_profile, schema=PROFILE_SCHEMA
+    )
+
+    async def _async_query_fleet(call: ServiceCall) -> ServiceResponse:
+        """Return the latest state of all devices matching the filters."""
+        store: FleetStateStore = hass.data[DATA_FLEET_STORE]
+        return {
+            "devices": store.query(
+                occupied=call.data.get(ATTR_OCCUPIED),
+                battery_below=call.data.get(ATTR_BATTERY_BELOW),
+            )
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_FLEET,
+        _async_query_fleet,
+        schema=QUERY_FLEET_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _write_profile(
+    profiler: cProfile.Profile, path: str, duration: float, top: int
+) -> str:
+    """Dump profiler stats to ``path`` and summarise this integration's costs."""
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(path)
+
+    # 只统计本集成内的函数，按累计耗时排序。
+    # cProfile 不区分线程，执行器中的调用也会计入，因此不推算事件循环占比
+    rows: list[tuple[float, float, int, str]] = []
+    for (filename, lineno, func), (_, ncalls, tottime, cumtime, _callers) in (
+        stats.stats.items()  # type: ignore[attr-defined]
+    ):
+        if not filename.startswith(_PACKAGE_DIR):
+            continue
+        rows.append(
+            (cumtime, tottime, ncalls, f"{Path(filename).name}:{lineno}({func})")
+        )
+    rows.sort(reverse=True)
+
+    lines = [
+        f"Profiled {duration:g} s. Stats file: `{path}`",
+        "",
+    ]
+    if not rows:
+        lines.append("No Linptech BLE code ran during the profile.")
+        return "\n".join(lines)
+
+    lines.extend(
+        [
+            "Times include the integration's executor jobs.",
+            "",
+            "| function | calls | total ms | cumulative ms | µs/call |",
+            "|---|---:|---:|---:|---:|",
+        ]
+    )
+    lines.extend(
+        f"| {name} | {ncalls} | {tottime * 1000:.2f} | {cumtime * 1000:.2f} "
+        f"| {cumtime / ncalls * 1e6:.1f} |"
+        for cumtime, tottime, ncalls, name in rows[:top]
+    )
+    return "\n".join(lines)
@@ -0,0 +1,184 @@
+"""
+Columnar fleet state store for Linptech BLE.
+
+A query index kept alongside the entity state: the processors' entity data
+still hold every device's values, and each decoded update is additionally
+copied into fixed-width ``array`` columns indexed by a compact slot number.
+This adds 29 bytes of column storage plus a slot index entry per device,
+and lets fleet-wide queries ("which seats are occupied", "which batteries
+are below 20%") scan a column with ``re``/``bytes.translate`` in C rather
+than iterating over every config entry and entity in Python.
+
+Unknown values are stored as sentinels (``-1``, ``255`` for the battery
+level, ``-128`` for RSSI) and returned as ``None``. This module has no Home
+Assistant dependency.
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .device import LinptechUpdate
+    from .linkstats import LinkStats
+
+_UNKNOWN = -1
+_UNKNOWN_BATTERY = 0xFF
+_UNKNOWN_RSSI = -128
+
+_ONE = re.compile(b"\x01")
+
+
+class FleetStateStore:
+    """Latest per-device values in array-backed columns."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._slots: dict[str, int] = {}
+        self._addresses: list[str] = []
+        self._free: list[int] = []
+        # 列存储：每个设备占用每列中的一个元素
+        # 电量对象是无符号字节，使用无符号列并以 255 作为未知值
+        self._battery = array("B")
+        self._state = array("b")
+        # 时长对象是无符号 32 位整数，使用 64 位有符号列以便保留 -1 作为未知值
+        self._present_duration = array("q")
+        self._not_present_duration = array("q")
+        self._rssi = array("b")
+        self._frame_cnt = array("h")
+        self._last_seen = array("d")
+
+    def __len__(self) -> int:
+        """Return the number of devices in the store."""
+        return len(self._slots)
+
+    def add(self, address: str) -> int:
+        """Add a device (or return its existing slot)."""
+        if (slot := self._slots.get(address)) is not None:
+            return slot
+        if self._free:
+            slot = self._free.pop()
+            self._addresses[slot] = address
+        else:
+            slot = len(self._addresses)
+            self._addresses.append(address)
+            self._battery.append(_UNKNOWN_BATTERY)
+            self._state.append(_UNKNOWN)
+            self._present_duration.append(_UNKNOWN)
+            self._not_present_duration.append(_UNKNOWN)
+            self._rssi.append(_UNKNOWN_RSSI)
+            self._frame_cnt.append(_UNKNOWN)
+            self._last_seen.append(0.0)
+        self._slots[address] = slot
+        return slot
+
+    def remove(self, address: str) -> None:
+        """Remove a device and recycle its slot."""
+        slot = self._slots.pop(address, None)
+        if slot is None:
+            return
+        self._addresses[slot] = ""
+        # 复位为未知值，使空闲槽位不会出现在查询结果中
+        self._battery[slot] = _UNKNOWN_BATTERY
+        self._state[slot] = _UNKNOWN
+        self._present_duration[slot] = _UNKNOWN
+        self._not_present_duration[slot] = _UNKNOWN
+        self._rssi[slot] = _UNKNOWN_RSSI
+        self._frame_cnt[slot] = _UNKNOWN
+        self._last_seen[slot] = 0.0
+        self._free.append(slot)
+
+    def record(self, slot: int, update: LinptechUpdate, link_stats: LinkStats) -> None:
+        """
+        Store the values carried by one decoded update.
+
+        Each PS1BB frame carries a single object, so only the fields present
+        in ``update`` are overwritten and the others keep their last value.
+        """
+        if update.battery is not None:
+            self._battery[slot] = update.battery
+        if update.pressure_state is not None:
+            self._state[slot] = update.pressure_state
+        if update.pressure_present_duration is not None:
+            self._present_duration[slot] = update.pressure_present_duration
+        if update.pressure_not_present_duration is not None:
+            self._not_present_duration[slot] = update.pressure_not_present_duration
+        if update.rssi is not None:
+            self._rssi[slot] = max(update.rssi, _UNKNOWN_RSSI + 1)
+        if link_stats.last_frame_cnt is not None:
+            self._frame_cnt[slot] = link_stats.last_frame_cnt
+        if link_stats.last_time is not None:
+            self._last_seen[slot] = link_stats.last_time
+
+    def get(self, address: str) -> dict[str, Any] | None:
+        """Return the stored values of one device."""
+        slot = self._slots.get(address)
+        return None if slot is None else self._row(slot)
+
+    def occupied(self) -> list[str]:
+        """Return the addresses of all devices currently reporting occupancy."""
+        addresses = self._addresses
+        return [addresses[slot] for slot in self._state_slots(occupied=True)]
+
+    def battery_below(self, threshold: int) -> list[str]:
+        """Return the addresses of devices with a known battery below ``threshold``."""
+        addresses = self._addresses
+        return [addresses[slot] for slot in self._battery_slots(threshold)]
+
+    def query(
+        self, *, occupied: bool | None = None, battery_below: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Return the rows of the devices matching all given filters."""
+        slots = set(self._slots.values())
+        if occupied is not None:
+            slots.intersection_update(self._state_slots(occupied=occupied))
+        if battery_below is not None:
+            slots.intersection_update(self._battery_slots(battery_below))
+        return [self._row(slot) for slot in sorted(slots)]
+
+    def _state_slots(self, *, occupied: bool) -> list[int]:
+        """Return the slots with a known pressure state equal to ``occupied``."""
+        table = bytearray(256)
+        table[int(occupied)] = 1
+        return _match_slots(self._state, bytes(table))
+
+    def _battery_slots(self, threshold: int) -> list[int]:
+        """Return the slots with a known battery level below ``threshold``."""
+        # 未知值 255 始终不被选中
+        table = bytes(int(value < threshold) for value in range(255)) + bytes(1)
+        return _match_slots(self._battery, table)
+
+    def _row(self, slot: int) -> dict[str, Any]:
+        """Return one device's values with sentinels mapped to ``None``."""
+
+        def _known(value: int) -> int | None:
+            return None if value == _UNKNOWN else value
+
+        battery = self._battery[slot]
+        state = self._state[slot]
+        rssi = self._rssi[slot]
+        last_seen = self._last_seen[slot]
+        return {
+            "address": self._addresses[slot],
+            "battery": None if battery == _UNKNOWN_BATTERY else battery,
+            "pressure_state": None if state == _UNKNOWN else bool(state),
+            "pressure_present_duration": _known(self._present_duration[slot]),
+            "pressure_not_present_duration": _known(self._not_present_duration[slot]),
+            "rssi": None if rssi == _UNKNOWN_RSSI else rssi,
+            "frame_counter": _known(self._frame_cnt[slot]),
+            "last_seen": last_seen or None,
+        }
+
+
+def _match_slots(column: array, table: bytes) -> list[int]:
+    """
+    Return the positions of a byte column selected by ``table``.
+
+    ``table`` maps every byte value (signed columns read as unsigned) to
+    ``1`` (selected) or ``0``; translation and search both run in C over the
+    whole column.
+    """
+    mask = memoryview(column).cast("B").tobytes().translate(table)
+    return [match.start() for match in _ONE.finditer(mask)]